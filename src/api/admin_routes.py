@@ -18,6 +18,7 @@ from ..database.supabase import (
     SYSTEM_CONFIG_KEYS,
     SYSTEM_USER_ID,
 )
+from ..database.cache import invalidate as invalidate_cached_user
 from ..users.manager import user_manager
 from ..users.credentials import update_user_credentials
 from ..telegram.client import get_telegram_config, TelegramConfigError
@@ -429,6 +430,7 @@ async def reset_user_onboarding(
             "telegram_connected": False,
             "mt_connected": False,
         }).eq("user_id", user_id).execute()
+        invalidate_cached_user(user_id)
 
         # Disconnect user if connected
         await user_manager.disconnect_user(user_id)
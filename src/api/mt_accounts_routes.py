@@ -21,6 +21,7 @@ from ..users.mt_accounts import (
     set_account_metaapi_id,
 )
 from ..database.supabase import get_system_config
+from ..trading._connection_pool import invalidate as invalidate_metaapi_connections
 from ..utils.logger import log
 
 
@@ -471,6 +472,8 @@ async def deploy_account(
             )
 
             if response.status_code in [200, 204]:
+                # Pooled RPC connections belong to the old deployment
+                await invalidate_metaapi_connections(account.metaapi_account_id)
                 log.info(
                     f"Account {action} initiated",
                     account_id=account_id,
@@ -525,12 +528,12 @@ async def reconnect_account(
     if not conn:
         raise HTTPException(status_code=400, detail="User not connected. Please refresh the page.")
 
-    # Disconnect existing executor if present
+    # Disconnect existing executor if present, closing its pooled connection
     if account_id in conn.account_executors:
         old_executor = conn.account_executors[account_id]
         if old_executor.executor:
             try:
-                await old_executor.executor.disconnect()
+                await old_executor.executor.disconnect(discard=True)
             except Exception as e:
                 log.warning(f"Error disconnecting old executor: {e}")
         del conn.account_executors[account_id]
@@ -618,6 +618,10 @@ async def save_trading_settings(
         if not success:
             raise HTTPException(status_code=500, detail="Failed to save settings")
 
+        # Already-connected users pick up the change (e.g. new channels) immediately
+        from ..users.manager import user_manager
+        await user_manager.reload_user_settings(user.id)
+
     return OnboardingCompleteResponse(
         success=True,
         message="Settings saved successfully",
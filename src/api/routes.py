@@ -464,10 +464,18 @@ async def update_settings_endpoint(
         await user_manager.reload_user_settings(user_id)
         print(f"[API] User settings reloaded in user_manager")
 
+        # Legacy single-user executor caches its settings too - re-read on next trade
+        copier = get_copier()
+        if copier and getattr(copier, "executor", None):
+            copier.executor.refresh_settings()
+
         # Auto-restart Telegram listener if channels changed
         if channels_changed:
             copier = get_copier()
             if copier:
+                # Don't let the running listener reuse its cached channel config
+                if getattr(copier, "telegram", None):
+                    copier.telegram.invalidate_config()
                 try:
                     import asyncio
                     asyncio.create_task(copier.restart_telegram())
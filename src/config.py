@@ -1,8 +1,9 @@
 """Configuration management using Pydantic settings."""
 import os
+import sys
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Optional
-from functools import lru_cache
+from typing import FrozenSet, List, Optional
+from functools import cached_property, lru_cache
 
 
 class Settings(BaseSettings):
@@ -71,10 +72,10 @@ class Settings(BaseSettings):
         """Parse comma-separated channel IDs into a list."""
         return [c.strip() for c in self.channel_ids.split(",") if c.strip()]
 
-    @property
-    def symbol_whitelist(self) -> List[str]:
-        """Parse comma-separated symbols into a list."""
-        return [s.strip().upper() for s in self.allowed_symbols.split(",") if s.strip()]
+    @cached_property
+    def symbol_whitelist(self) -> FrozenSet[str]:
+        """Parse comma-separated symbols into a set (built once, checked per signal)."""
+        return frozenset(sys.intern(s.strip().upper()) for s in self.allowed_symbols.split(",") if s.strip())
 
     @property
     def auto_accept_list(self) -> List[str]:
@@ -0,0 +1,99 @@
+"""Process-wide TTL cache for hot Supabase lookups.
+
+Settings, system config and credentials are read on every signal but only
+change when someone edits them, so each lookup keeps its result for a short
+TTL. Write paths call ``invalidate()`` so edits take effect immediately.
+"""
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+DEFAULT_TTL = 30.0  # seconds
+
+
+class TTLCache:
+    """Thread-safe dict with per-entry expiry.
+
+    Safe to share between the event loop and ``asyncio.to_thread`` workers.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, maxsize: int = 10_000):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid.
+            maxsize: Entry limit; the cache is cleared when it is exceeded.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Look up a key.
+
+        Returns:
+            (hit, value) - value is None on a miss or expired entry.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            with self._lock:
+                # Only drop it if nobody refreshed the entry meanwhile
+                if self._data.get(key) is entry:
+                    del self._data[key]
+            return False, None
+        return True, value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value for the configured TTL."""
+        with self._lock:
+            if len(self._data) >= self.maxsize and key not in self._data:
+                # Rare in practice (one entry per active user); a full reset keeps it simple
+                self._data.clear()
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one key, or everything when key is None."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+
+# user_id -> formatted settings dict (get_settings)
+settings_cache = TTLCache()
+# single entry keyed by None -> system config dict (get_system_config)
+system_config_cache = TTLCache()
+# user_id -> raw user_settings_v2 row (get_user_settings)
+user_settings_cache = TTLCache()
+# user_id -> UserCredentials (get_user_credentials)
+credentials_cache = TTLCache()
+# user_id -> ValidatorSettings built from get_settings (trading.validator)
+validator_settings_cache = TTLCache()
+
+
+def invalidate_settings(user_id: Optional[str] = None):
+    """Drop every cached view of a user's user_settings_v2 row.
+
+    Args:
+        user_id: User whose settings changed, or None for all users.
+    """
+    settings_cache.invalidate(user_id)
+    user_settings_cache.invalidate(user_id)
+    validator_settings_cache.invalidate(user_id)
+
+
+def invalidate(user_id: Optional[str] = None):
+    """Drop cached rows for a user, or every cached row when user_id is None.
+
+    Args:
+        user_id: User whose settings/credentials changed.
+    """
+    invalidate_settings(user_id)
+    credentials_cache.invalidate(user_id)
+    if user_id is None:
+        system_config_cache.invalidate()
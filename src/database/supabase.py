@@ -1,9 +1,11 @@
 """Supabase client for user settings storage."""
+import copy
 import os
 from typing import Optional
 from supabase import create_client, Client
 
 from ..config import settings as app_settings
+from .cache import invalidate_settings, settings_cache, system_config_cache
 
 # Initialize Supabase clients
 _supabase: Optional[Client] = None
@@ -89,6 +91,9 @@ def get_supabase_admin() -> Client:
 def get_settings(user_id: str) -> dict:
     """Get settings for a user, create defaults if not exists.
 
+    Results are cached per user for a short TTL; update_settings() drops
+    the cached copy.
+
     Args:
         user_id: Required - the authenticated user's UUID. Must be provided explicitly.
 
@@ -98,6 +103,10 @@ def get_settings(user_id: str) -> dict:
     if not user_id:
         raise ValueError("user_id is required - authentication required for settings access")
 
+    hit, cached = settings_cache.get(user_id)
+    if hit:
+        return copy.deepcopy(cached)
+
     try:
         # Use admin client to bypass RLS for backend operations
         supabase = get_supabase_admin()
@@ -109,7 +118,9 @@ def get_settings(user_id: str) -> dict:
             .execute()
 
         if result.data and len(result.data) > 0:
-            return _format_settings(result.data[0])
+            formatted = _format_settings(result.data[0])
+            settings_cache.set(user_id, formatted)
+            return copy.deepcopy(formatted)
 
         # Create default settings for new user
         new_settings = {**DEFAULT_SETTINGS, "user_id": user_id}
@@ -118,7 +129,9 @@ def get_settings(user_id: str) -> dict:
             .execute()
 
         if result.data and len(result.data) > 0:
-            return _format_settings(result.data[0])
+            formatted = _format_settings(result.data[0])
+            settings_cache.set(user_id, formatted)
+            return copy.deepcopy(formatted)
 
         # Return defaults if insert failed
         return _get_default_response()
@@ -132,6 +145,7 @@ def update_settings(user_id: str, settings: dict) -> dict:
     """Update settings for a user."""
     # Use admin client to bypass RLS for backend operations
     supabase = get_supabase_admin()
+    invalidate_settings(user_id)
 
     print(f"[Supabase] update_settings called for user {user_id[:8]}...")
     print(f"[Supabase] Input settings: {settings}")
@@ -200,6 +214,9 @@ def update_settings(user_id: str, settings: dict) -> dict:
             # Return current settings instead of defaults to preserve data
             return get_settings(user_id)
 
+    # Drop anything a concurrent reader cached while the write was in flight
+    invalidate_settings(user_id)
+
     result = result_or_error
     if result.data and len(result.data) > 0:
         print(f"[Supabase] Success! telegram_channel_ids in result: {result.data[0].get('telegram_channel_ids')}")
@@ -276,7 +293,12 @@ def get_system_config() -> dict:
 
     Only returns GLOBAL admin/infrastructure settings.
     User-specific settings are in user_credentials/user_settings_v2.
+    Cached for a short TTL; update_system_config() drops the cached copy.
     """
+    hit, cached = system_config_cache.get(None)
+    if hit:
+        return copy.deepcopy(cached)
+
     # Default values - only global admin settings
     defaults = {
         # LLM - shared API key for signal parsing
@@ -298,7 +320,8 @@ def get_system_config() -> dict:
             if key and value:  # Only override if value is not empty
                 config[key] = value
 
-        return config
+        system_config_cache.set(None, config)
+        return copy.deepcopy(config)
 
     except Exception as e:
         print(f"[Supabase] Error getting system config: {e}")
@@ -343,6 +366,7 @@ def update_system_config(updates: dict) -> dict:
                 "value": str(value) if value is not None else "",
             }, on_conflict="key").execute()
 
+        system_config_cache.invalidate()
         return get_system_config()
 
     except Exception as e:
@@ -355,6 +379,7 @@ def delete_system_config_key(key: str) -> bool:
     try:
         supabase = get_supabase_admin()
         supabase.table("system_config").delete().eq("key", key).execute()
+        system_config_cache.invalidate()
         return True
     except Exception as e:
         print(f"[Supabase] Error deleting config key {key}: {e}")
@@ -16,6 +16,7 @@ from .telegram.client import TelegramConfigError
 from .parser.llm_parser import SignalParser
 from .trading.validator import TradeValidator
 from .trading.executor import TradeExecutor
+from .trading._connection_pool import close_all as close_metaapi_connections
 from .utils.events import event_bus, Events
 from .utils.logger import log
 
@@ -898,16 +899,12 @@ class SignalCopier:
             return
 
         # Close all matching positions
-        closed_count = 0
-        for pos in matching:
-            position_id = pos.get("id") or pos.get("positionId")
-            if position_id:
-                try:
-                    await self.executor.close_position(str(position_id))
-                    closed_count += 1
-                    log.info("Position closed", position_id=position_id, symbol=symbol)
-                except Exception as e:
-                    log.error("Failed to close position", position_id=position_id, error=str(e))
+        position_ids = [
+            str(pos.get("id") or pos.get("positionId"))
+            for pos in matching
+            if pos.get("id") or pos.get("positionId")
+        ]
+        closed_count = len(await self.executor.close_positions(position_ids))
 
         # Update signal status
         if closed_count > 0:
@@ -1427,6 +1424,9 @@ async def run_multi_tenant():
         if result.data:
             log.info(f"Found {len(result.data)} active users to connect")
 
+            # Load everyone's credentials/settings concurrently up front
+            await user_manager.prefetch_profiles([profile["id"] for profile in result.data])
+
             for profile in result.data:
                 user_id = profile["id"]
                 email = profile.get("email", "unknown")
@@ -1442,9 +1442,12 @@ async def run_multi_tenant():
                 except Exception as connect_err:
                     log.error(f"Error connecting user {user_id[:8]}", error=str(connect_err))
 
-            # Wait for connections to establish
+            # Wait (up to 5s) for connections to establish
             log.info("Waiting for connections to establish...")
-            await asyncio.sleep(5)
+            await asyncio.gather(*(
+                user_manager.wait_connected(user_id, timeout=5)
+                for user_id in list(user_manager._connections)
+            ))
 
             # Log final status
             for conn_id, conn in user_manager._connections.items():
@@ -1514,6 +1517,8 @@ async def main():
         else:
             await copier.stop()
 
+        await close_metaapi_connections()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
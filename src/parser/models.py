@@ -1,5 +1,6 @@
 """Pydantic models for signal parsing."""
-from pydantic import BaseModel, Field
+import sys
+from pydantic import BaseModel, Field, field_validator
 from datetime import datetime
 from typing import Literal, Optional, List
 
@@ -39,6 +40,13 @@ class ParsedSignal(BaseModel):
     parsed_at: datetime
     warnings: List[str] = Field(default_factory=list)
 
+    @field_validator("symbol")
+    @classmethod
+    def _intern_symbol(cls, v: str) -> str:
+        # A handful of symbols recur on every signal; interned copies make the
+        # validator's pip-table and position-index lookups identity hits
+        return sys.intern(v)
+
 
 class ValidationResult(BaseModel):
     """Result of trade validation."""
@@ -658,21 +658,13 @@ class SignalRouter:
                     if p.get("symbol", "").upper().replace(symbol_suffix.upper(), "") == symbol.upper()
                 ]
 
-                closed = 0
-                for pos in matching:
-                    position_id = pos.get("id") or pos.get("positionId")
-                    if position_id:
-                        try:
-                            await ae.executor.close_position(str(position_id))
-                            closed += 1
-                        except Exception as e:
-                            log.error(
-                                f"{user_tag}Failed to close position on '{ae.account_alias}'",
-                                position_id=position_id,
-                                error=str(e),
-                            )
-
-                return closed
+                position_ids = [
+                    str(pos.get("id") or pos.get("positionId"))
+                    for pos in matching
+                    if pos.get("id") or pos.get("positionId")
+                ]
+                closed = await ae.executor.close_positions(position_ids)
+                return len(closed)
             except Exception as e:
                 log.error(
                     f"{user_tag}Failed to get positions on '{ae.account_alias}'",
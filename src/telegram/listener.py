@@ -1,21 +1,102 @@
 """Telegram channel listener for trading signals."""
 import asyncio
-from datetime import datetime
-from typing import Callable, List, Optional
-from telethon import TelegramClient, events
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from telethon import TelegramClient, events, utils
+from telethon.errors import ChannelInvalidError, ChannelPrivateError, RPCError
 from telethon.sessions import StringSession
 from telethon.tl.types import Channel
 
-from .client import create_telegram_client, get_telegram_config
+from .client import get_telegram_config
+from ..users.credentials import update_user_credentials
 from ..utils.logger import log
 
 # Connection stability constants
 MAX_RECONNECT_ATTEMPTS = 10
 INITIAL_RECONNECT_DELAY = 5  # seconds
 MAX_RECONNECT_DELAY = 300   # 5 minutes max backoff
-HEALTH_CHECK_INTERVAL = 60  # Check connection health every 60 seconds
+HEALTH_CHECK_INTERVAL = 60  # Initial health check interval (seconds)
+HEALTH_CHECK_INTERVAL_MIN = 30   # Poll this often once a connection has been silent for a while
+HEALTH_CHECK_INTERVAL_MAX = 240  # Poll this rarely while messages are flowing
 STALE_CONNECTION_THRESHOLD = 300  # Log warning if no messages for 5 minutes
 FORCE_RECONNECT_THRESHOLD = 600   # Force reconnect if no messages for 10 minutes (channels may be quiet)
+ME_CACHE_TTL = 300  # Reuse get_me() results in diagnostics for 5 minutes
+SESSION_PERSIST_DEBOUNCE = 2.0  # Coalesce session changes into one DB write
+
+# Caps concurrent client handshakes so a mass reconnect after an outage
+# doesn't hit Telegram (and FLOOD_WAIT) with every listener at once
+_RECONNECT_SEMAPHORE = asyncio.Semaphore(int(os.getenv("TELEGRAM_MAX_CONCURRENT_RECONNECTS", "8")))
+
+# Strong references to running background tasks; the event loop only keeps
+# weak ones, so an unreferenced task can be garbage collected mid-flight.
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _spawn(coro) -> asyncio.Task:
+    """Create a background task that stays referenced until it finishes."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+def _seconds_since(mono: Optional[float]) -> Optional[float]:
+    """Seconds elapsed since a time.monotonic() stamp, or None if unset."""
+    if mono is None:
+        return None
+    return time.monotonic() - mono
+
+
+def _mono_to_datetime(mono: Optional[float]) -> Optional[datetime]:
+    """Convert a time.monotonic() stamp to an approximate UTC datetime."""
+    elapsed = _seconds_since(mono)
+    if elapsed is None:
+        return None
+    return datetime.utcnow() - timedelta(seconds=elapsed)
+
+
+def _has_signal_text(event) -> bool:
+    """Cheap NewMessage prefilter: only texts long enough to be a signal."""
+    text = event.message.text
+    return bool(text) and len(text) >= 5
+
+
+class _TrackedStringSession(StringSession):
+    """StringSession that reports auth key and DC changes.
+
+    Telethon mutates the session in place when it rotates the auth key or
+    migrates DC. Hooking those setters lets the listener persist the session
+    exactly when it changes instead of polling session.save().
+    """
+
+    def __init__(self, string: Optional[str] = None, on_change: Optional[Callable[[], None]] = None):
+        super().__init__(string)
+        self._on_change = on_change
+
+    def _notify(self):
+        if self._on_change:
+            self._on_change()
+
+    def set_dc(self, dc_id, server_address, port):
+        changed = (dc_id, server_address, port) != (self._dc_id, self._server_address, self._port)
+        super().set_dc(dc_id, server_address, port)
+        if changed:
+            self._notify()
+
+    @property
+    def auth_key(self):
+        return self._auth_key
+
+    @auth_key.setter
+    def auth_key(self, value):
+        # Telethon re-assigns the same key on every connect; only a new key is a change
+        changed = value != self._auth_key
+        self._auth_key = value
+        if changed:
+            self._notify()
 
 
 class TelegramListener:
@@ -26,6 +107,46 @@ class TelegramListener:
     2. Multi-user: Uses per-user credentials passed at initialization
     """
 
+    # One listener per connected user; slots keep the per-instance footprint small
+    __slots__ = (
+        "user_id",
+        "client",
+        "_api_id",
+        "_api_hash",
+        "_phone",
+        "_session_string",
+        "_channel_ids",
+        "_user_tag",
+        "_on_message",
+        "_channels",
+        "_chan_meta",
+        "_channel_info_cache",
+        "_parsed_channel_specs",
+        "_entity_cache",
+        "_config_cache",
+        "_is_multi_tenant",
+        "_is_connected",
+        "_is_reconnecting",
+        "_last_activity_mono",
+        "_last_health_check_mono",
+        "_reconnect_attempts",
+        "_started_at",
+        "_health_task",
+        "_health_interval_min",
+        "_health_interval_max",
+        "_should_stop",
+        "_stop_event",
+        "_session_lock",
+        "_session_cache",
+        "_session_dirty",
+        "_session_dirty_event",
+        "_session_task",
+        "_force_reconnect_requested",
+        "_health_wake",
+        "_main_task",
+        "_me_cache",
+    )
+
     def __init__(
         self,
         user_id: Optional[str] = None,
@@ -34,6 +155,8 @@ class TelegramListener:
         phone: Optional[str] = None,
         session_string: Optional[str] = None,
         channel_ids: Optional[List[str]] = None,
+        health_check_interval_min: float = HEALTH_CHECK_INTERVAL_MIN,
+        health_check_interval_max: float = HEALTH_CHECK_INTERVAL_MAX,
     ):
         """Initialize the Telegram listener.
 
@@ -44,8 +167,11 @@ class TelegramListener:
             phone: Phone number for verification (None uses global settings).
             session_string: Saved session string for reconnection.
             channel_ids: List of channel IDs/usernames to monitor (None uses global settings).
+            health_check_interval_min: Shortest sleep between health checks (seconds).
+            health_check_interval_max: Longest sleep between health checks (seconds).
         """
         self.user_id = user_id
+        self._user_tag = f"[user:{user_id[:8]}] " if user_id else ""  # Log prefix
         self._api_id = api_id
         self._api_hash = api_hash
         self._phone = phone
@@ -55,37 +181,94 @@ class TelegramListener:
         self.client: Optional[TelegramClient] = None
         self._on_message: Optional[Callable] = None
         self._channels: List = []
+        self._chan_meta: Dict[int, dict] = {}  # chat_id -> on_message payload template
+        self._channel_info_cache: List[dict] = []  # get_channel_info() payload for self._channels
+        self._parsed_channel_specs: Optional[Tuple[Tuple[str, object], ...]] = None
+        self._entity_cache: Dict[Tuple[str, object], object] = {}  # parsed spec -> resolved entity
+        self._config_cache: Optional[Tuple[float, dict]] = None  # (monotonic ts, telegram config)
         self._is_multi_tenant = user_id is not None
         
         # Connection status tracking
         self._is_connected = False
         self._is_reconnecting = False
-        self._last_activity: Optional[datetime] = None
-        self._last_health_check: Optional[datetime] = None
+        self._last_activity_mono: Optional[float] = None  # time.monotonic() of last event
+        self._last_health_check_mono: Optional[float] = None  # time.monotonic() of last passed check
         self._reconnect_attempts = 0
         self._started_at: Optional[datetime] = None
         self._health_task: Optional[asyncio.Task] = None
+        self._health_interval_min = health_check_interval_min
+        self._health_interval_max = health_check_interval_max
         self._should_stop = False  # Flag to stop the reconnect loop
+        self._stop_event = asyncio.Event()  # Set by stop(); interrupts reconnect backoff
         self._session_lock = asyncio.Lock()  # Prevent concurrent session writes
+        self._session_cache: Optional[str] = None  # Last serialized session string
+        self._session_dirty = True  # Re-serialize on next get_session_string()
+        self._session_dirty_event = asyncio.Event()  # Wakes the session persist task
+        self._session_task: Optional[asyncio.Task] = None
+        self._main_task: Optional[asyncio.Task] = None  # Reconnect loop started by start(), awaited by stop()
+        self._me_cache: Optional[Tuple[float, dict]] = None  # (monotonic ts, me_info) for diagnostics
         self._force_reconnect_requested = False  # External trigger for forced reconnect
+        self._health_wake = asyncio.Event()  # Wakes the health check loop early
 
     def _create_client(self) -> TelegramClient:
-        """Create Telegram client based on mode."""
+        """Create Telegram client based on mode.
+
+        Sessions are kept in memory as a string session: Telethon's default
+        SQLite session does blocking disk IO on every auth key or entity
+        update. Changes are persisted to the database by the session task.
+        The exception is legacy mode without a saved session string, which
+        keeps the on-disk session file - nothing would persist it otherwise.
+        """
         if self._is_multi_tenant:
-            # Multi-tenant: use per-user credentials with stability settings
-            session = StringSession(self._session_string) if self._session_string else StringSession()
-            return TelegramClient(
-                session,
-                self._api_id,
-                self._api_hash,
-                connection_retries=10,
-                retry_delay=1,
-                auto_reconnect=True,
-                request_retries=5,
-            )
+            # Multi-tenant: use per-user credentials
+            api_id, api_hash = self._api_id, self._api_hash
+            session_string = self._session_string
+        else:
+            # Legacy: use global settings, keeping any session rotated since startup
+            config = self._cached_config()
+            api_id, api_hash = config["api_id"], config["api_hash"]
+            session_string = self._session_string or config.get("session")
+
+        if session_string or self._is_multi_tenant:
+            session = _TrackedStringSession(session_string or "", on_change=self._mark_session_dirty)
+            # The new session serializes back to the string it was loaded from;
+            # it only needs re-serializing once _TrackedStringSession reports a change
+            self._session_cache = session_string or None
         else:
-            # Legacy: use global settings (already has stability settings)
-            return create_telegram_client()
+            # Fall back to file-based session (will require interactive verification once)
+            session = "signal_session"
+            self._session_cache = None
+            log.debug("Using file-based Telegram session (may require verification)")
+        self._session_dirty = False
+        return TelegramClient(
+            session,
+            api_id,
+            api_hash,
+            connection_retries=10,
+            retry_delay=1,
+            auto_reconnect=True,
+            request_retries=5,
+        )
+
+    def _seconds_since_activity(self) -> Optional[float]:
+        """Seconds since the last event, or None if none was seen yet."""
+        return _seconds_since(self._last_activity_mono)
+
+    @property
+    def _last_activity(self) -> Optional[datetime]:
+        """Wall-clock time of the last event, derived on demand for status output."""
+        return _mono_to_datetime(self._last_activity_mono)
+
+    @property
+    def _last_health_check(self) -> Optional[datetime]:
+        """Wall-clock time of the last passed health check, for status output."""
+        return _mono_to_datetime(self._last_health_check_mono)
+
+    def _mark_session_dirty(self):
+        """Flag the session as changed and wake the persist task."""
+        self._session_dirty = True
+        self._me_cache = None  # New auth key - re-verify who we are on next diagnostic
+        self._session_dirty_event.set()
     
     def is_connected(self) -> bool:
         """Check if the Telegram client is currently connected."""
@@ -93,7 +276,8 @@ class TelegramListener:
             return False
         try:
             return self.client.is_connected() and self._is_connected
-        except:
+        except (AttributeError, RPCError, OSError):
+            # Client torn down mid-check or socket already gone
             return False
     
     def get_connection_status(self) -> dict:
@@ -108,21 +292,70 @@ class TelegramListener:
             "channels_count": len(self._channels),
         }
 
+    def _cached_config(self, ttl: float = 60.0) -> dict:
+        """Get the database Telegram config, reusing a recent lookup.
+
+        Reconnect storms and dashboard polls would otherwise hit the
+        database on every _get_phone()/_get_channel_list() call.
+        """
+        if self._config_cache and time.monotonic() - self._config_cache[0] < ttl:
+            return self._config_cache[1]
+        config = get_telegram_config()
+        self._config_cache = (time.monotonic(), config)
+        return config
+
+    def invalidate_config(self, channel_ids: Optional[List[str]] = None):
+        """Drop the cached Telegram config and parsed channel list.
+
+        Call after editing Telegram settings; the next reconnect re-reads
+        the database and resolves channels from scratch.
+
+        Args:
+            channel_ids: New channel list for a multi-tenant listener (its
+                channels come from the user's settings, not the database config).
+        """
+        if channel_ids is not None and self._is_multi_tenant:
+            self._channel_ids = channel_ids
+        self._config_cache = None
+        self._parsed_channel_specs = None
+        self._entity_cache.clear()
+
     def _get_phone(self) -> str:
         """Get phone number based on mode."""
         if self._is_multi_tenant:
             return self._phone
         # Get from database config
-        config = get_telegram_config()
-        return config["phone"]
+        return self._cached_config()["phone"]
 
     def _get_channel_list(self) -> List[str]:
         """Get channel list based on mode."""
-        if self._is_multi_tenant and self._channel_ids:
-            return self._channel_ids
+        if self._is_multi_tenant:
+            # A tenant with no channels monitors nothing - never fall back to the admin's list
+            return self._channel_ids or []
         # Get from database config
-        config = get_telegram_config()
-        return config["channel_ids"]
+        return self._cached_config()["channel_ids"]
+
+    @staticmethod
+    def _parse_spec(channel_id) -> Tuple[str, object]:
+        """Classify a configured channel into its resolution strategy.
+
+        Returns:
+            ("user", "@name"), ("id", int) or ("raw", str).
+        """
+        channel_id_str = str(channel_id).strip()
+        if channel_id_str.startswith("@"):
+            return ("user", channel_id_str)
+        if channel_id_str.lstrip("-").isdigit():
+            try:
+                return ("id", int(channel_id_str))
+            except ValueError:
+                pass  # e.g. "--123", resolve as-is
+        # Might be an invite link or other format
+        return ("raw", channel_id_str)
+
+    def _parse_channel_specs(self) -> Tuple[Tuple[str, object], ...]:
+        """Parse the configured channel list once for reuse across reconnects."""
+        return tuple(self._parse_spec(c) for c in self._get_channel_list())
 
     async def start(self, on_message: Callable):
         """Start the Telegram listener with auto-reconnect.
@@ -134,18 +367,39 @@ class TelegramListener:
         self._on_message = on_message
         self._started_at = datetime.utcnow()
         self._should_stop = False
-        user_tag = f"[user:{self.user_id[:8]}] " if self.user_id else ""
+        self._stop_event.clear()
+        self._parsed_channel_specs = self._parse_channel_specs()
+        self._entity_cache.clear()
+        # Run the loop in a task of its own so stop() can cancel it without
+        # cancelling whoever awaited start()
+        main_task = self._main_task = asyncio.create_task(self._reconnect_loop())
 
-        # Reconnect loop with exponential backoff
+        try:
+            await main_task
+        except asyncio.CancelledError:
+            # Swallow only the cancel stop() sent to the loop, not one aimed at our caller
+            if not main_task.cancelled() or asyncio.current_task().cancelling():
+                raise
+        finally:
+            if self._main_task is main_task:
+                self._main_task = None
+
+    async def _reconnect_loop(self):
+        """Connect and listen until stopped, reconnecting with backoff on errors."""
+        user_tag = self._user_tag
         while not self._should_stop:
             try:
-                await self._connect_and_listen(user_tag)
+                await self._connect_and_listen()
             except Exception as e:
                 # Check if we should stop before reconnecting
                 if self._should_stop:
                     log.info(f"{user_tag}Telegram listener stopped")
                     break
 
+                if isinstance(e, (ChannelPrivateError, ChannelInvalidError)):
+                    # A cached channel is no longer accessible - resolve from scratch
+                    self._entity_cache.clear()
+
                 self._is_connected = False
                 self._is_reconnecting = True
                 self._reconnect_attempts += 1
@@ -159,24 +413,36 @@ class TelegramListener:
                     self._is_reconnecting = False
                     raise
 
-                # Exponential backoff with jitter
-                delay = min(
+                # Exponential backoff with half jitter - spreads reconnects of many
+                # listeners that dropped at the same time across [cap/2, cap]
+                # while keeping a minimum wait
+                cap = min(
                     INITIAL_RECONNECT_DELAY * (2 ** (self._reconnect_attempts - 1)),
                     MAX_RECONNECT_DELAY
                 )
+                delay = random.uniform(cap * 0.5, cap)
                 log.warning(
                     f"{user_tag}Telegram connection lost, reconnecting...",
                     attempt=self._reconnect_attempts,
-                    delay=delay,
+                    cap=cap,
+                    delay=round(delay, 1),
                     error=str(e),
                 )
 
-                await asyncio.sleep(delay)
+                # Wait out the backoff, but return at once if stop() is called
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+                    break
+                except asyncio.TimeoutError:
+                    pass
 
         log.info(f"{user_tag}Telegram listener loop exited")
     
-    async def _connect_and_listen(self, user_tag: str):
+    async def _connect_and_listen(self):
         """Internal method to connect and start listening."""
+        user_tag = self._user_tag
+        # A previous attempt may have failed before reaching its own cleanup
+        await self._cancel_background_tasks()
         self.client = self._create_client()
 
         log.info(f"{user_tag}Starting Telegram client...")
@@ -185,10 +451,11 @@ class TelegramListener:
         # This can block waiting for verification codes which shouldn't happen
         # if we have a valid session
         try:
-            await asyncio.wait_for(
-                self.client.start(phone=self._get_phone()),
-                timeout=60.0  # 60 seconds should be plenty for session-based auth
-            )
+            async with _RECONNECT_SEMAPHORE:
+                await asyncio.wait_for(
+                    self.client.start(phone=self._get_phone()),
+                    timeout=60.0  # 60 seconds should be plenty for session-based auth
+                )
         except asyncio.TimeoutError:
             log.error(f"{user_tag}Telegram client.start() timed out - session may be invalid")
             if self.client:
@@ -198,20 +465,39 @@ class TelegramListener:
         self._is_connected = True
         self._is_reconnecting = False
         self._reconnect_attempts = 0
-        self._last_activity = datetime.utcnow()
+        self._last_activity_mono = time.monotonic()
         log.info(f"{user_tag}Telegram client connected")
 
+        # Prime the diagnostics cache so dashboards don't need their own get_me()
+        try:
+            self._remember_me(await asyncio.wait_for(self.client.get_me(), timeout=10.0))
+        except Exception as e:
+            # Diagnostics only - never let this abort the connect
+            log.debug(f"{user_tag}Could not prime get_me cache: {e}")
+
         # Save session string for reconnection and persist to database
         if self.client:
-            new_session = self.client.session.save()
-            if new_session != self._session_string:
-                self._session_string = new_session
-                # Persist to database so it survives restarts
-                await self._persist_session(user_tag)
+            await self._flush_session()
 
         # Resolve channel IDs
         self._channels = await self._resolve_channels()
 
+        # Per-chat metadata is fixed for the lifetime of this connection, so
+        # compute it once here instead of on every message.
+        # Keys are marked peer IDs (-100...) to match event.chat_id.
+        self._chan_meta = {}
+        for c in self._channels:
+            peer_id = utils.get_peer_id(c)
+            self._chan_meta[peer_id] = self._payload_template(str(peer_id), getattr(c, "title", "Unknown"))
+        self._channel_info_cache = [
+            {
+                "id": getattr(c, "id", None),
+                "title": getattr(c, "title", "Unknown"),
+                "username": getattr(c, "username", None),
+            }
+            for c in self._channels
+        ]
+
         # For shared listener (user_id=None), we listen to ALL channels dynamically
         # so empty channel list is OK - filtering happens server-side via subscriber cache
         if not self._channels and self.user_id is not None:
@@ -224,14 +510,20 @@ class TelegramListener:
         # Capture self in closure for logging
         listener_self = self
         listener_user_tag = user_tag
-        listener_id = id(self)
 
         # For shared listener (user_id=None), listen to ALL channels and filter server-side
         # This allows dynamic channel additions without restart
         listen_to_all = self.user_id is None
         chat_filter = None if listen_to_all else self._channels
 
-        @self.client.on(events.NewMessage(chats=chat_filter))
+        @self.client.on(events.Raw)
+        async def on_update(_update):
+            """Any update from Telegram proves the connection is alive."""
+            listener_self._last_activity_mono = time.monotonic()
+
+        # The func filter runs synchronously in Telethon's dispatch, so
+        # stickers/media/short edits never get a handler coroutine
+        @self.client.on(events.NewMessage(chats=chat_filter, func=_has_signal_text))
         async def handler(event):
             """Event handler for new messages - wrapped with error handling."""
             try:
@@ -242,16 +534,7 @@ class TelegramListener:
                     if not isinstance(chat, Channel):
                         return
 
-                # Log immediately when event handler fires - before any processing
-                log.info(
-                    f"{listener_user_tag}⚡ RAW EVENT RECEIVED",
-                    listener_id=listener_id,
-                    message_id=event.message.id,
-                    chat_id=event.chat_id,
-                    chat_title=getattr(event.chat, 'title', 'unknown'),
-                )
-                listener_self._last_activity = datetime.utcnow()
-
+                # Per-message receipt is logged once in _handle_message
                 # Verify the callback is still set
                 if listener_self._on_message is None:
                     log.error(f"{listener_user_tag}❌ MESSAGE HANDLER IS NONE - cannot process!")
@@ -281,8 +564,9 @@ class TelegramListener:
             phone=self._phone[-4:] if self._phone else None,  # Last 4 digits for privacy
         )
 
-        # Start health check background task
-        self._health_task = asyncio.create_task(self._health_check_loop(user_tag))
+        # Start health check and session persistence background tasks
+        self._health_task = _spawn(self._health_check_loop())
+        self._session_task = _spawn(self._session_persist_loop())
         log.debug(f"{user_tag}Started connection health monitor (interval: {HEALTH_CHECK_INTERVAL}s)")
 
         # Keep running - this blocks until disconnected
@@ -291,114 +575,183 @@ class TelegramListener:
         # If we get here, we were disconnected
         self._is_connected = False
 
-        # Cancel health check task
-        if self._health_task and not self._health_task.done():
-            self._health_task.cancel()
-            try:
-                await self._health_task
-            except asyncio.CancelledError:
-                pass
+        await self._cancel_background_tasks()
 
         log.warning(f"{user_tag}Telegram client disconnected")
 
-    async def _resolve_channels(self) -> List:
-        """Resolve channel IDs/usernames to entities.
+    async def _cancel_background_tasks(self):
+        """Cancel the health and session tasks and wait for them to finish."""
+        for task in (self._health_task, self._session_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                except Exception as e:
+                    log.warning(f"{self._user_tag}Background task failed during cancel: {e}")
+        self._health_task = None
+        self._session_task = None
+
+    async def _resolve_spec(self, kind: str, value):
+        """Resolve a single parsed channel spec to an entity.
 
         Returns:
-            List of resolved channel entities.
+            Resolved entity, or None if a numeric ID could not be found.
         """
-        channels = []
-        channel_list = self._get_channel_list()
-        user_tag = f"[user:{self.user_id[:8]}] " if self.user_id else ""
-        failed_channels = []
+        if kind != "id":
+            # Username or raw string (invite link etc.) - resolve as-is
+            return await self.client.get_entity(value)
 
-        log.info(f"{user_tag}📋 Resolving {len(channel_list)} channels: {channel_list}")
+        # Numeric ID - try as-is first
+        numeric_id = value
+        try:
+            return await self.client.get_entity(numeric_id)
+        except ValueError:
+            # If that fails and it's positive, try with -100 prefix (channel format)
+            if numeric_id > 0:
+                try:
+                    return await self.client.get_entity(int(f"-100{numeric_id}"))
+                except Exception:
+                    pass
+            # If negative without -100, try adding -100
+            elif not str(numeric_id).startswith("-100"):
+                try:
+                    return await self.client.get_entity(int(f"-100{abs(numeric_id)}"))
+                except Exception:
+                    pass
+        return None
 
-        for channel_id in channel_list:
-            try:
-                channel_id_str = str(channel_id).strip()
-                entity = None
-
-                # Try multiple resolution strategies
-                if channel_id_str.startswith("@"):
-                    # Username format
-                    entity = await self.client.get_entity(channel_id_str)
-                elif channel_id_str.lstrip("-").isdigit():
-                    # Numeric ID - try as-is first
-                    numeric_id = int(channel_id_str)
-                    try:
-                        entity = await self.client.get_entity(numeric_id)
-                    except ValueError:
-                        # If that fails and it's positive, try with -100 prefix (channel format)
-                        if numeric_id > 0:
-                            try:
-                                entity = await self.client.get_entity(int(f"-100{numeric_id}"))
-                            except Exception:
-                                pass
-                        # If negative without -100, try adding -100
-                        elif not str(numeric_id).startswith("-100"):
-                            try:
-                                entity = await self.client.get_entity(int(f"-100{abs(numeric_id)}"))
-                            except Exception:
-                                pass
-                else:
-                    # Try as-is (might be an invite link or other format)
-                    entity = await self.client.get_entity(channel_id_str)
+    async def _resolve_channels(self) -> List:
+        """Resolve channel IDs/usernames to entities.
 
-                if entity:
-                    channels.append(entity)
-                    name = getattr(entity, "title", channel_id_str)
-                    entity_id = getattr(entity, "id", "unknown")
-                    log.info(
-                        f"{user_tag}✅ Channel resolved",
-                        channel=name,
-                        input_id=channel_id_str,
-                        resolved_id=entity_id,
-                    )
-                else:
-                    failed_channels.append(channel_id_str)
-                    log.error(f"{user_tag}❌ Could not resolve channel", channel=channel_id_str)
+        Entities resolved on a previous connect are reused from
+        _entity_cache. Remaining usernames and numeric IDs are each
+        resolved with a single batched get_entity() call; everything else
+        (and any batch that fails) is resolved concurrently, so startup
+        costs a couple of round trips instead of one per channel.
 
+        Returns:
+            List of resolved channel entities.
+        """
+        if self._parsed_channel_specs is None:
+            self._parsed_channel_specs = self._parse_channel_specs()
+        channel_specs = self._parsed_channel_specs
+        user_tag = self._user_tag
+
+        log.info(f"{user_tag}📋 Resolving {len(channel_specs)} channels")
+
+        # Results indexed like channel_specs to keep the configured order.
+        # Entities resolved on an earlier connect are reused without a round trip.
+        entity_cache = self._entity_cache
+        results: List[object] = [entity_cache.get(spec) for spec in channel_specs]
+
+        # Usernames and numeric IDs are each resolved with one batched call;
+        # raw strings (invite links etc.) can't be batched
+        pending_idx = [
+            i for i, (kind, _) in enumerate(channel_specs) if kind == "raw" and results[i] is None
+        ]
+        for batch_kind in ("user", "id"):
+            batch_idx = [
+                i for i, (kind, _) in enumerate(channel_specs) if kind == batch_kind and results[i] is None
+            ]
+            if not batch_idx:
+                continue
+            try:
+                entities = await self.client.get_entity([channel_specs[i][1] for i in batch_idx])
+                for i, entity in zip(batch_idx, entities):
+                    results[i] = entity
             except Exception as e:
-                failed_channels.append(str(channel_id))
-                log.error(
-                    f"{user_tag}❌ Channel resolution error",
-                    channel=channel_id,
+                # One bad entry fails the whole batch - resolve them individually
+                # (numeric IDs also get the -100 prefix fallbacks there)
+                log.debug(
+                    f"{user_tag}Batch {batch_kind} resolution failed, retrying individually",
                     error=str(e),
-                    error_type=type(e).__name__,
                 )
+                pending_idx.extend(batch_idx)
+
+        if pending_idx:
+            outcomes = await asyncio.gather(
+                *(self._resolve_spec(*channel_specs[i]) for i in pending_idx),
+                return_exceptions=True,
+            )
+            for i, outcome in zip(pending_idx, outcomes):
+                results[i] = outcome
+
+        # Collected per channel and logged once at the end, so large channel
+        # lists don't produce a log line per channel
+        channels = []
+        resolved: List[Tuple[str, str]] = []  # (input_id, title)
+        failed: List[Tuple[str, str]] = []  # (input_id, reason)
+
+        for spec, entity in zip(channel_specs, results):
+            channel_id_str = str(spec[1])
+            if isinstance(entity, Exception):
+                failed.append((channel_id_str, f"{type(entity).__name__}: {entity}"))
+            elif entity:
+                entity_cache[spec] = entity
+                channels.append(entity)
+                resolved.append((channel_id_str, getattr(entity, "title", channel_id_str)))
+            else:
+                failed.append((channel_id_str, "not found"))
 
         # Log summary
         log.info(
             f"{user_tag}📊 Channel resolution complete",
             resolved=len(channels),
-            failed=len(failed_channels),
-            failed_list=failed_channels if failed_channels else None,
+            failed=len(failed),
+            channels=resolved,
         )
+        if failed:
+            log.error(f"{user_tag}❌ Could not resolve channels", failures=failed)
 
         return channels
 
+    def _payload_template(self, channel_id: str, channel_name: str) -> dict:
+        """Build the per-channel part of the on_message payload.
+
+        Returns:
+            Dict with channel_name, channel_id and user_id; _handle_message
+            copies it and adds text, message_id and date.
+        """
+        return {
+            "channel_name": channel_name,
+            "channel_id": channel_id,
+            "user_id": self.user_id,  # Include user context for multi-tenant
+        }
+
     async def _handle_message(self, event):
         """Handle incoming message event.
 
         Args:
             event: Telethon message event.
         """
-        message = event.message
+        # No callback registered (teardown or misconfigured listener) - nothing to do
+        if self._on_message is None:
+            return
 
-        # Get channel info
-        chat = event.chat
-        channel_name = getattr(chat, "title", "Unknown")
-        channel_id = str(event.chat_id)
+        message = event.message
 
         # Extract text
         text = message.text or ""
 
-        # Skip empty or very short messages
-        if not text or len(text.strip()) < 5:
+        # Skip empty or very short messages (the event filter already dropped len < 5)
+        if len(text.strip()) < 5:
             return
 
-        user_tag = f"[user:{self.user_id[:8]}] " if self.user_id else ""
+        # Per-channel payload fields (precomputed for monitored channels)
+        template = self._chan_meta.get(event.chat_id)
+        if template is None:
+            # Shared listener or a channel resolved after startup
+            try:
+                channel_name = event.chat.title
+            except AttributeError:
+                channel_name = "Unknown"
+            template = self._payload_template(str(event.chat_id), channel_name)
+        channel_id = template["channel_id"]
+        channel_name = template["channel_name"]
+
+        user_tag = self._user_tag
         log.info(
             f"{user_tag}📨 TELEGRAM MESSAGE RECEIVED",
             channel=channel_name,
@@ -409,40 +762,28 @@ class TelegramListener:
         )
 
         # Call the message handler
-        if self._on_message:
-            try:
-                handler_name = getattr(self._on_message, '__name__', 'unknown')
-                log.info(
-                    f"{user_tag}📤 INVOKING MESSAGE HANDLER",
-                    handler=handler_name,
-                    message_id=message.id,
-                    channel=channel_name,
-                )
-                await self._on_message({
-                    "text": text,
-                    "channel_name": channel_name,
-                    "channel_id": channel_id,
-                    "message_id": message.id,
-                    "date": message.date,
-                    "user_id": self.user_id,  # Include user context for multi-tenant
-                })
-                log.info(
-                    f"{user_tag}✅ MESSAGE HANDLER COMPLETED",
-                    message_id=message.id,
-                )
-            except Exception as e:
-                log.error(
-                    f"{user_tag}❌ MESSAGE HANDLER ERROR",
-                    error=str(e),
-                    error_type=type(e).__name__,
-                    channel=channel_name,
-                    message_id=message.id,
-                    exc_info=True,
-                )
-        else:
-            log.error(f"{user_tag}❌ NO MESSAGE HANDLER SET - message dropped!")
+        try:
+            payload = template.copy()
+            payload["text"] = text
+            payload["message_id"] = message.id
+            payload["date"] = message.date
+            await self._on_message(payload)
+            log.debug(
+                f"{user_tag}✅ MESSAGE HANDLER COMPLETED",
+                handler=getattr(self._on_message, '__name__', 'unknown'),
+                message_id=message.id,
+            )
+        except Exception as e:
+            log.error(
+                f"{user_tag}❌ MESSAGE HANDLER ERROR",
+                error=str(e),
+                error_type=type(e).__name__,
+                channel=channel_name,
+                message_id=message.id,
+                exc_info=True,
+            )
 
-    async def _health_check_loop(self, user_tag: str):
+    async def _health_check_loop(self):
         """Background task to monitor connection health.
 
         Periodically pings Telegram to verify the connection is actually working,
@@ -452,10 +793,23 @@ class TelegramListener:
         Handles two scenarios:
         1. Connection failures (ping timeout) - immediate reconnect
         2. Stale connection (no messages for extended period) - proactive reconnect
+
+        Activity is stamped by an events.Raw handler on every incoming update,
+        so the loop only pings with get_me() once the connection has gone
+        quiet. The interval adapts to traffic: while updates keep arriving
+        checks back off and skip the ping; as silence grows they tighten
+        towards health_check_interval_min.
         """
+        user_tag = self._user_tag
+        interval = HEALTH_CHECK_INTERVAL
         while self._is_connected:
             try:
-                await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+                # Sleep until the next check, or until request_reconnect() wakes us
+                try:
+                    await asyncio.wait_for(self._health_wake.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._health_wake.clear()
 
                 if not self._is_connected or not self.client:
                     break
@@ -468,26 +822,25 @@ class TelegramListener:
                         await self.client.disconnect()
                     break
 
-                now = datetime.utcnow()
-
-                # Track time since last MESSAGE (not health check)
-                time_since_message = (
-                    (now - self._last_activity).total_seconds()
-                    if self._last_activity else 999999
-                )
+                # Track time since last UPDATE (not health check)
+                time_since_message = self._seconds_since_activity()
+                if time_since_message is None:
+                    time_since_message = 999999
+
+                # An update since the last check proves the connection works
+                message_seen = time_since_message < interval
+                interval = self._next_health_interval(time_since_message)
+                if message_seen:
+                    self._last_health_check_mono = time.monotonic()
+                    log.debug(
+                        f"{user_tag}💓 HEALTH: connection=OK (recent update), next check in {int(interval)}s",
+                    )
+                    continue
 
                 # Ping Telegram to verify connection
                 try:
-                    await asyncio.wait_for(self.client.get_me(), timeout=10.0)
-                    self._last_health_check = now
-
-                    # Check if session has changed (auth key updates) and persist if so
-                    if self.client and self.user_id:
-                        current_session = self.client.session.save()
-                        if current_session != self._session_string:
-                            self._session_string = current_session
-                            await self._persist_session(user_tag)
-                            log.info(f"{user_tag}Session updated and persisted")
+                    self._remember_me(await asyncio.wait_for(self.client.get_me(), timeout=10.0))
+                    self._last_health_check_mono = time.monotonic()
 
                     # Log health status - distinguish between connection and message health
                     log.info(
@@ -509,14 +862,14 @@ class TelegramListener:
                 # Log warning if connection seems quiet
                 if time_since_message > STALE_CONNECTION_THRESHOLD:
                     log.warning(
-                        f"{user_tag}⚠️ No messages in {int(time_since_message)}s (connection OK, channels may be quiet)",
+                        f"{user_tag}⚠️ No updates in {int(time_since_message)}s (connection OK, channels may be quiet)",
                     )
 
-                # Force reconnect if no messages for extended period
+                # Force reconnect if no updates for extended period
                 # This handles "zombie" connections that appear healthy but aren't receiving events
                 if time_since_message > FORCE_RECONNECT_THRESHOLD:
                     log.warning(
-                        f"{user_tag}🔄 No messages for {int(time_since_message)}s - forcing reconnect",
+                        f"{user_tag}🔄 No updates for {int(time_since_message)}s - forcing reconnect",
                     )
                     if self.client:
                         await self.client.disconnect()
@@ -530,18 +883,30 @@ class TelegramListener:
 
         log.debug(f"{user_tag}Health check loop ended")
 
+    def _next_health_interval(self, time_since_message: float) -> float:
+        """Pick the next health check sleep from how long the channels have been silent.
+
+        Starts at health_check_interval_max and halves for every further
+        max-interval of silence, bounded below by health_check_interval_min
+        and above by STALE_CONNECTION_THRESHOLD.
+        """
+        silent_periods = min(int(time_since_message // self._health_interval_max), 16)
+        interval = self._health_interval_max / (2 ** silent_periods)
+        return max(self._health_interval_min, min(interval, STALE_CONNECTION_THRESHOLD))
+
     def request_reconnect(self):
         """Request a forced reconnection.
 
         This can be called externally (e.g., from watchdog or API) to trigger
-        a reconnection cycle. The health check loop will pick this up and
-        initiate the reconnection process.
+        a reconnection cycle. The health check loop is woken right away and
+        initiates the reconnection process.
 
         Use this when connection appears healthy but messages aren't being received.
         """
-        user_tag = f"[user:{self.user_id[:8]}] " if self.user_id else ""
+        user_tag = self._user_tag
         log.info(f"{user_tag}🔄 Reconnect requested externally")
         self._force_reconnect_requested = True
+        self._health_wake.set()
 
     async def stop(self):
         """Stop the Telegram listener with proper cleanup.
@@ -550,8 +915,9 @@ class TelegramListener:
         1. Signaling all loops to stop
         2. Canceling background tasks with timeout
         3. Disconnecting the Telethon client with timeout
+        4. Canceling and awaiting the task running start()
         """
-        user_tag = f"[user:{self.user_id[:8]}] " if self.user_id else ""
+        user_tag = self._user_tag
 
         log.info(
             f"{user_tag}🛑 LISTENER STOPPING",
@@ -561,17 +927,26 @@ class TelegramListener:
 
         # 1. Signal all loops to stop first
         self._should_stop = True
+        self._stop_event.set()  # Cut short any reconnect backoff
         self._is_connected = False
 
-        # 2. Cancel health check task gracefully with timeout
-        if self._health_task and not self._health_task.done():
-            self._health_task.cancel()
+        # 2. Cancel background tasks gracefully with timeout
+        for task in (self._health_task, self._session_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await asyncio.wait_for(task, timeout=2.0)
+                except (asyncio.CancelledError, asyncio.TimeoutError):
+                    pass
+                except Exception as e:
+                    log.warning(f"{user_tag}Error canceling background task: {e}")
+
+        # A session change may still be waiting out the persist debounce
+        if self.client and self._session_dirty_event.is_set():
             try:
-                await asyncio.wait_for(self._health_task, timeout=2.0)
-            except (asyncio.CancelledError, asyncio.TimeoutError):
-                pass
+                await asyncio.wait_for(self._flush_session(), timeout=3.0)
             except Exception as e:
-                log.warning(f"{user_tag}Error canceling health task: {e}")
+                log.warning(f"{user_tag}Could not persist session on stop: {e}")
 
         # 3. Disconnect Telethon client with timeout
         if self.client:
@@ -587,19 +962,70 @@ class TelegramListener:
             finally:
                 self.client = None
 
+        # 4. Make sure the reconnect loop has actually exited
+        main_task = self._main_task
+        if main_task and not main_task.done() and main_task is not asyncio.current_task():
+            main_task.cancel()
+            done, _ = await asyncio.wait({main_task}, timeout=5.0)
+            if not done:
+                log.warning(f"{user_tag}Listener task did not exit within 5s of cancel")
+
         log.info(f"{user_tag}Listener stopped")
 
     def get_session_string(self) -> Optional[str]:
         """Get the current session string for persistence.
 
+        The serialized session is cached and only recomputed after a point
+        where Telethon may have mutated it (login, auth key rotation).
+
         Returns:
             Session string if connected, None otherwise.
         """
-        if self.client and hasattr(self.client.session, 'save'):
-            return self.client.session.save()
-        return self._session_string
+        if self._session_dirty and self.client:
+            self._session_cache = self.client.session.save()
+            self._session_dirty = False
+        return self._session_cache or self._session_string
+
+    async def _flush_session(self) -> bool:
+        """Persist the session if it differs from the last saved string.
+
+        Returns:
+            True if a new session string was saved.
+        """
+        current_session = self.get_session_string()
+        if not current_session or current_session == self._session_string:
+            return False
+
+        self._session_string = current_session
+        # Persist to database so it survives restarts
+        await self._persist_session()
+        return True
+
+    async def _session_persist_loop(self):
+        """Background task that persists the session when Telethon changes it.
+
+        Sleeps on an event set by _TrackedStringSession instead of polling,
+        so the database is only written when the auth key or DC changes, and
+        at most once per SESSION_PERSIST_DEBOUNCE seconds.
+        """
+        user_tag = self._user_tag
+        while True:
+            try:
+                await self._session_dirty_event.wait()
+                # Debounce: let a burst of changes (DC migration + new auth key)
+                # settle so they land in a single write of the latest session
+                await asyncio.sleep(SESSION_PERSIST_DEBOUNCE)
+                self._session_dirty_event.clear()
+                if not self.client:
+                    continue
+                if await self._flush_session():
+                    log.info(f"{user_tag}Session updated and persisted")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                log.error(f"{user_tag}Session persist loop error", error=str(e))
 
-    async def _persist_session(self, user_tag: str = ""):
+    async def _persist_session(self):
         """Persist the current session string to the database.
 
         This ensures the session survives server restarts and auth key updates
@@ -608,17 +1034,19 @@ class TelegramListener:
         Uses a lock to prevent race conditions when multiple operations
         try to persist the session concurrently.
         """
+        user_tag = self._user_tag
         if not self.user_id or not self._session_string:
             return
 
         # Acquire lock to prevent concurrent session writes
         async with self._session_lock:
             try:
-                from ..users.credentials import update_user_credentials
-
-                success = update_user_credentials(self.user_id, {
-                    "telegram_session_encrypted": self._session_string,
-                })
+                # Supabase client is synchronous - keep the DB round-trip off the event loop
+                success = await asyncio.to_thread(
+                    update_user_credentials,
+                    self.user_id,
+                    {"telegram_session_encrypted": self._session_string},
+                )
 
                 if success:
                     log.debug(f"{user_tag}Session persisted to database")
@@ -628,20 +1056,32 @@ class TelegramListener:
             except Exception as e:
                 log.error(f"{user_tag}Error persisting session", error=str(e))
 
+    def _remember_me(self, me) -> Optional[dict]:
+        """Cache the account info returned by get_me().
+
+        Returns:
+            Dict with id, username and phone, or None if not authorized.
+        """
+        if me is None:
+            self._me_cache = None
+            return None
+        me_info = {
+            "id": me.id,
+            "username": me.username,
+            "phone": me.phone,
+        }
+        self._me_cache = (time.monotonic(), me_info)
+        return me_info
+
     async def get_channel_info(self) -> List[dict]:
         """Get information about monitored channels.
 
+        The list is rebuilt whenever channels are resolved on connect.
+
         Returns:
             List of channel info dicts.
         """
-        info = []
-        for channel in self._channels:
-            info.append({
-                "id": getattr(channel, "id", None),
-                "title": getattr(channel, "title", "Unknown"),
-                "username": getattr(channel, "username", None),
-            })
-        return info
+        return self._channel_info_cache
 
     async def get_diagnostic_info(self) -> dict:
         """Get comprehensive diagnostic information about this listener.
@@ -660,14 +1100,12 @@ class TelegramListener:
             try:
                 client_connected = self.client.is_connected()
                 if client_connected:
-                    me = await asyncio.wait_for(self.client.get_me(), timeout=5.0)
-                    client_authorized = me is not None
-                    if me:
-                        me_info = {
-                            "id": me.id,
-                            "username": me.username,
-                            "phone": me.phone,
-                        }
+                    if self._me_cache and time.monotonic() - self._me_cache[0] < ME_CACHE_TTL:
+                        me_info = self._me_cache[1]
+                    else:
+                        me = await asyncio.wait_for(self.client.get_me(), timeout=5.0)
+                        me_info = self._remember_me(me)
+                    client_authorized = me_info is not None
             except asyncio.TimeoutError:
                 client_connected = False
             except Exception as e:
@@ -685,13 +1123,9 @@ class TelegramListener:
             handlers_registered = handler_count > 0
 
         # Calculate time since last activity
-        time_since_activity = None
-        if self._last_activity:
-            time_since_activity = (now - self._last_activity).total_seconds()
+        time_since_activity = self._seconds_since_activity()
 
-        time_since_health_check = None
-        if self._last_health_check:
-            time_since_health_check = (now - self._last_health_check).total_seconds()
+        time_since_health_check = _seconds_since(self._last_health_check_mono)
 
         return {
             "user_id": self.user_id[:8] if self.user_id else None,
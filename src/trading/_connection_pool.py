@@ -0,0 +1,271 @@
+"""Shared MetaApi RPC connections.
+
+Connecting an executor means deploy + wait_connected + wait_synchronized,
+which takes seconds. Handles are keyed by (token, account id) and kept open
+while any executor holds them, then for MAX_INACTIVE_LIFETIME seconds after
+the last release so a reconnect or retry picks up the warm connection.
+
+Connections known to be bad (failed connect, forced reconnect, redeploy)
+are evicted with discard() / invalidate() so the next get_connection()
+builds a fresh one.
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from metaapi_cloud_sdk import MetaApi
+
+from ..utils.logger import log
+
+# Seconds an unused handle stays open before the reaper closes it
+MAX_INACTIVE_LIFETIME = int(os.getenv("METAAPI_POOL_IDLE_SECONDS", "600"))
+REAP_INTERVAL = 60
+
+PoolKey = Tuple[str, str]
+
+
+@dataclass
+class ConnectionHandle:
+    """A connected MetaApi account shared between executors."""
+
+    key: PoolKey
+    api: Any
+    account: Any
+    rpc: Any
+    ref_count: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+
+# One MetaApi client per token (it owns the websocket clients)
+_apis: Dict[str, MetaApi] = {}
+_handles: Dict[PoolKey, ConnectionHandle] = {}
+_locks: Dict[PoolKey, asyncio.Lock] = {}
+_reaper_task: Optional[asyncio.Task] = None
+
+
+def _get_api(token: str) -> MetaApi:
+    api = _apis.get(token)
+    if api is None:
+        api = _apis[token] = MetaApi(token)
+    return api
+
+
+async def get_connection(
+    token: str,
+    account_id: str,
+    timeout_seconds: int = 300,
+    user_tag: str = "",
+) -> ConnectionHandle:
+    """Get a connected handle for an account, connecting it if needed.
+
+    Every successful call must be paired with release().
+
+    Args:
+        token: MetaApi token.
+        account_id: MetaApi account ID.
+        timeout_seconds: Maximum time to wait for connection and sync.
+        user_tag: Log prefix identifying the user.
+
+    Returns:
+        ConnectionHandle with its ref_count already incremented.
+
+    Raises:
+        RuntimeError: If the account cannot be fetched or connected.
+    """
+    _ensure_reaper()
+    key = (token, account_id)
+
+    while True:
+        lock = _locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if _locks.get(key) is not lock:
+                continue  # Lock was dropped with an evicted/reaped handle while we waited
+
+            handle = _handles.get(key)
+            if handle is not None and getattr(handle.rpc, "_closed", False):
+                # Closed underneath us - don't hand out a dead connection
+                log.info(f"{user_tag}Pooled MetaApi connection was closed, reconnecting")
+                del _handles[key]
+                handle = None
+            if handle is None:
+                handle = await _connect(key, timeout_seconds, user_tag)
+                _handles[key] = handle
+            else:
+                log.info(f"{user_tag}Reusing pooled MetaApi connection", refs=handle.ref_count)
+            handle.ref_count += 1
+            handle.last_used = time.monotonic()
+            return handle
+
+
+def release(handle: ConnectionHandle):
+    """Return a handle to the pool; it closes once idle long enough.
+
+    Args:
+        handle: Handle obtained from get_connection().
+    """
+    handle.ref_count = max(0, handle.ref_count - 1)
+    handle.last_used = time.monotonic()
+
+
+async def discard(handle: ConnectionHandle):
+    """Return a handle and close its connection now instead of pooling it.
+
+    Use when the connection is suspect (forced reconnect, failed connect)
+    so the next get_connection() starts from scratch. Other executors
+    still holding the handle keep the closed connection until they
+    reconnect.
+
+    Args:
+        handle: Handle obtained from get_connection().
+    """
+    handle.ref_count = max(0, handle.ref_count - 1)
+    await _evict(handle)
+
+
+async def invalidate(account_id: str):
+    """Close and drop every pooled connection for an account.
+
+    Called after the account is deployed/redeployed, which replaces the
+    server-side connection.
+
+    Args:
+        account_id: MetaApi account ID.
+    """
+    for key, handle in list(_handles.items()):
+        if key[1] == account_id:
+            await _evict(handle)
+
+
+async def _evict(handle: ConnectionHandle):
+    """Remove a handle from the pool (if still current) and close it."""
+    if _handles.get(handle.key) is handle:
+        del _handles[handle.key]
+        lock = _locks.get(handle.key)
+        if lock and not lock.locked():
+            del _locks[handle.key]
+    log.info("Evicting pooled MetaApi connection", account_id=handle.key[1][:8])
+    await _close(handle)
+
+
+async def close_all():
+    """Close every pooled connection (application shutdown)."""
+    global _reaper_task
+    if _reaper_task:
+        _reaper_task.cancel()
+        _reaper_task = None
+
+    handles = list(_handles.values())
+    _handles.clear()
+    _locks.clear()
+    for handle in handles:
+        await _close(handle)
+
+    # The MetaApi clients own websocket connections and background jobs
+    apis = list(_apis.values())
+    _apis.clear()
+    for api in apis:
+        try:
+            api.close()
+        except Exception as e:
+            log.error("Error closing MetaApi client", error=str(e))
+
+
+async def _connect(key: PoolKey, timeout_seconds: int, user_tag: str) -> ConnectionHandle:
+    """Fetch, deploy, connect and synchronize an account."""
+    token, account_id = key
+    log.info(f"{user_tag}Connecting to MetaApi...")
+
+    api = _get_api(token)
+    try:
+        account = await api.metatrader_account_api.get_account(account_id)
+    except Exception as e:
+        error_msg = str(e)
+        if "not found" in error_msg.lower():
+            raise RuntimeError(f"MetaAPI account not found: {account_id[:8]}...")
+        raise RuntimeError(f"Failed to get MetaAPI account: {error_msg}")
+
+    # Deploy if needed
+    if account.state != "DEPLOYED":
+        log.info(f"{user_tag}Deploying MetaApi account (state: {account.state})...")
+        try:
+            await account.deploy()
+        except Exception as e:
+            log.warning(f"{user_tag}Deploy call returned error (may be already deploying): {e}")
+
+    # Wait for connection with timeout
+    log.info(f"{user_tag}Waiting for account connection (timeout: {timeout_seconds}s)...")
+    try:
+        await asyncio.wait_for(account.wait_connected(), timeout=timeout_seconds)
+    except asyncio.TimeoutError:
+        # Check current state for better error message
+        try:
+            await account.reload()
+            state = account.state
+            connection_status = getattr(account, 'connection_status', 'unknown')
+        except Exception:
+            state = "unknown"
+            connection_status = "unknown"
+
+        raise RuntimeError(
+            f"Connection timed out after {timeout_seconds}s. "
+            f"Account state: {state}, connection: {connection_status}. "
+            "The broker may be slow or credentials may be incorrect."
+        )
+
+    # Get RPC connection
+    log.info(f"{user_tag}Getting RPC connection...")
+    rpc = account.get_rpc_connection()
+
+    try:
+        await rpc.connect()
+    except Exception as e:
+        try:
+            await rpc.close()
+        except Exception:
+            pass
+        raise RuntimeError(f"Failed to establish RPC connection: {e}")
+
+    # Wait for synchronization with timeout
+    log.info(f"{user_tag}Waiting for synchronization...")
+    try:
+        await asyncio.wait_for(rpc.wait_synchronized(), timeout=timeout_seconds)
+    except asyncio.TimeoutError:
+        log.warning(
+            f"{user_tag}Synchronization timed out after {timeout_seconds}s, "
+            "but connection is established. Trading may work with limited data."
+        )
+        # Don't raise - connection might still be usable for trading
+
+    return ConnectionHandle(key=key, api=api, account=account, rpc=rpc)
+
+
+async def _close(handle: ConnectionHandle):
+    try:
+        await handle.rpc.close()
+    except Exception as e:
+        log.error("Error closing pooled MetaApi connection", account_id=handle.key[1][:8], error=str(e))
+
+
+def _ensure_reaper():
+    global _reaper_task
+    if _reaper_task is None or _reaper_task.done():
+        _reaper_task = asyncio.create_task(_reap_idle())
+
+
+async def _reap_idle():
+    """Close handles nobody has used for MAX_INACTIVE_LIFETIME seconds."""
+    while True:
+        await asyncio.sleep(REAP_INTERVAL)
+        now = time.monotonic()
+        for key, handle in list(_handles.items()):
+            if handle.ref_count or now - handle.last_used < MAX_INACTIVE_LIFETIME:
+                continue
+            lock = _locks.get(key)
+            if lock and lock.locked():
+                continue
+            del _handles[key]
+            _locks.pop(key, None)
+            log.info("Closing idle MetaApi connection", account_id=key[1][:8])
+            await _close(handle)
@@ -0,0 +1,70 @@
+"""Recently seen symbol prices, per MetaApi RPC connection.
+
+The RPC connection has no push API for ticks, so prices are recorded
+whenever a get_symbol_price call returns (executor probes, validator
+checks). Reads within max_age reuse the recorded quote instead of another
+round trip; older entries trigger a fresh fetch.
+"""
+import time
+from typing import Any, Dict, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+# Quotes older than this are refetched (seconds)
+DEFAULT_MAX_AGE = 2.0
+
+# connection -> {broker symbol: (price dict, monotonic timestamp)}
+_prices: "WeakKeyDictionary[Any, Dict[str, Tuple[dict, float]]]" = WeakKeyDictionary()
+
+
+def record(connection: Any, symbol: str, price: dict):
+    """Remember a quote returned by get_symbol_price.
+
+    Args:
+        connection: MetaApi RPC connection the quote came from.
+        symbol: Broker symbol.
+        price: Price dict (bid/ask).
+    """
+    try:
+        _prices.setdefault(connection, {})[symbol] = (price, time.monotonic())
+    except TypeError:
+        pass  # Connection type doesn't support weak references - nothing to cache
+
+
+def get(connection: Any, symbol: str, max_age: float = DEFAULT_MAX_AGE) -> Optional[dict]:
+    """Get a recorded quote if it is fresh enough.
+
+    Args:
+        connection: MetaApi RPC connection.
+        symbol: Broker symbol.
+        max_age: Maximum quote age in seconds.
+
+    Returns:
+        Price dict, or None if missing or stale.
+    """
+    try:
+        entry = _prices.get(connection, {}).get(symbol)
+    except TypeError:
+        return None
+    if entry and time.monotonic() - entry[1] < max_age:
+        return entry[0]
+    return None
+
+
+async def get_symbol_price(connection: Any, symbol: str, max_age: float = DEFAULT_MAX_AGE) -> dict:
+    """Get a quote, reusing a recent one when available.
+
+    Args:
+        connection: MetaApi RPC connection.
+        symbol: Broker symbol.
+        max_age: Maximum age in seconds of a reused quote.
+
+    Returns:
+        Price dict (bid/ask).
+    """
+    price = get(connection, symbol, max_age)
+    if price is None:
+        # Keep the terminal subscribed so the next fetch is served warm
+        price = await connection.get_symbol_price(symbol, keep_subscription=True)
+        if price:
+            record(connection, symbol, price)
+    return price
@@ -1,16 +1,105 @@
 """MetaApi trade execution."""
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+import asyncio
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
+from functools import lru_cache
 
 from metaapi_cloud_sdk import MetaApi
 
 from ..database.supabase import get_system_config, get_settings, SYSTEM_USER_ID
 from ..parser.models import ParsedSignal, TradeExecution
 from ..utils.logger import log
+from . import _connection_pool, _price_cache
+
+# Order type -> (MetaApi RPC connection method, whether it takes an entry price).
+# Market orders fill at the current price; pending orders need the entry level.
+_ORDER_DISPATCH = {
+    "ORDER_TYPE_BUY": ("create_market_buy_order", False),
+    "ORDER_TYPE_SELL": ("create_market_sell_order", False),
+    "ORDER_TYPE_BUY_LIMIT": ("create_limit_buy_order", True),
+    "ORDER_TYPE_SELL_LIMIT": ("create_limit_sell_order", True),
+    "ORDER_TYPE_BUY_STOP": ("create_stop_buy_order", True),
+    "ORDER_TYPE_SELL_STOP": ("create_stop_sell_order", True),
+}
+
+# [is_sell][entry below / within / above the market band]
+_ORDER_TYPES = (
+    ("ORDER_TYPE_BUY_LIMIT", "ORDER_TYPE_BUY", "ORDER_TYPE_BUY_STOP"),
+    ("ORDER_TYPE_SELL_STOP", "ORDER_TYPE_SELL", "ORDER_TYPE_SELL_LIMIT"),
+)
+
+# Max position modify/close RPCs in flight per executor (MetaApi rate limits)
+_POSITION_BATCH_CONCURRENCY = 10
+# Max TP legs of one signal submitted at once; 1 places them one after another
+# for brokers that throttle concurrent submissions
+_MAX_CONCURRENT_TP_ORDERS = int(os.getenv("METAAPI_MAX_CONCURRENT_TP_ORDERS", "4"))
+
+_GOLD_SYMBOLS = frozenset({"XAUUSD", "GOLD"})
+
+# Hour-of-week (weekday * 24 + hour, UTC) -> forex/metals closed: Friday 22:00 to Sunday end
+_WEEKEND_HOURS = bytes(
+    d in (5, 6) or (d == 4 and h >= 22)
+    for d in range(7)
+    for h in range(24)
+)
+
+# Crypto trades through the weekend, so a missing price there isn't "market closed"
+_CRYPTO_RE = re.compile("BTC|ETH|XRP|LTC|ADA|DOT|DOGE|SOL|MATIC|AVAX|LINK")
+
+# Fixed pending-vs-market thresholds for non-gold symbols (gold is per-user)
+_INDEX_PRICE_THRESHOLDS = {
+    "DJ30": 10.0,
+    "US30": 10.0,
+    "USTEC": 10.0,
+    "NAS100": 10.0,
+}
+
+
+@lru_cache(maxsize=64)
+def _static_price_threshold(symbol: str) -> float:
+    """Get the fixed price threshold for an upper-cased non-gold symbol."""
+    if "JPY" in symbol:
+        return 0.05
+    return _INDEX_PRICE_THRESHOLDS.get(symbol, 0.0005)
+
+
+def _parse_tp_ratios(value: Any) -> Optional[List[float]]:
+    """Parse tp_split_ratios from user settings.
+
+    Accepts a list of numbers or a comma-separated string such as
+    "0.5, 0.3, 0.2". Any entry that isn't a positive number makes the whole
+    setting unusable - it is logged and the defaults apply.
+
+    Args:
+        value: Raw setting value.
+
+    Returns:
+        Positive ratios, or None (use the defaults) if the setting is unusable.
+    """
+    if value is None:
+        return None
+    entries = value.split(",") if isinstance(value, str) else value
+    ratios = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = entry.strip()
+            if not entry:
+                continue
+        try:
+            ratio = float(entry)
+        except (TypeError, ValueError):
+            ratio = None
+        if ratio is None or not ratio > 0:
+            log.warning("Invalid tp_split_ratios, using defaults", value=value, entry=entry)
+            return None
+        ratios.append(ratio)
+    return ratios or None
 
 
-@dataclass
+@dataclass(slots=True)
 class AccountExecutionResult:
     """Result of executing a signal on a single MT account."""
 
@@ -21,7 +110,7 @@ class AccountExecutionResult:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MultiAccountExecutionResult:
     """Aggregated result of executing a signal across multiple MT accounts."""
 
@@ -58,7 +147,7 @@ class MultiAccountExecutionResult:
         return f"Failed on all {self.total_accounts} account(s)"
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutorSettings:
     """Per-user trading settings for the executor."""
     symbol_suffix: str = ""
@@ -68,10 +157,30 @@ class ExecutorSettings:
     gold_market_threshold: float = 3.0
     max_lot_size: float = 0.1
     default_lot_size: float = 0.01
+    # TP count -> normalized ratios, filled lazily by split_ratios()
+    _split_ratios: Dict[int, Tuple[float, ...]] = field(default_factory=dict, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        if self.tp_ratios is None:
-            self.tp_ratios = [0.5, 0.3, 0.2]
+        # Every constructor (from_user_settings, the multi-tenant manager)
+        # gets the same validation - a zero or non-numeric ratio would
+        # otherwise fail in split_ratios() mid-trade
+        self.tp_ratios = _parse_tp_ratios(self.tp_ratios) or [0.5, 0.3, 0.2]
+
+    def split_ratios(self, tp_count: int) -> Tuple[float, ...]:
+        """Get the lot ratios for a signal with tp_count TPs, normalized to sum to 1.
+
+        Args:
+            tp_count: Number of take profits on the signal.
+
+        Returns:
+            One ratio per TP (fewer if tp_ratios is shorter).
+        """
+        ratios = self._split_ratios.get(tp_count)
+        if ratios is None:
+            ratios = self.tp_ratios[:tp_count]
+            total = sum(ratios)
+            ratios = self._split_ratios[tp_count] = tuple(r / total for r in ratios)
+        return ratios
 
     @classmethod
     def from_user_settings(cls, user_id: str = SYSTEM_USER_ID) -> "ExecutorSettings":
@@ -82,15 +191,10 @@ class ExecutorSettings:
         """
         settings = get_settings(user_id)
 
-        # tp_split_ratios comes as list from user_settings
-        tp_ratios = settings.get("tp_split_ratios", [0.5, 0.3, 0.2])
-        if isinstance(tp_ratios, str):
-            tp_ratios = [float(r.strip()) for r in tp_ratios.split(",") if r.strip()]
-
         return cls(
             symbol_suffix=settings.get("symbol_suffix", ""),
             split_tps=settings.get("split_tps", True),
-            tp_ratios=tp_ratios,
+            tp_ratios=settings.get("tp_split_ratios"),
             tp_lot_mode=settings.get("tp_lot_mode", "split"),
             gold_market_threshold=float(settings.get("gold_market_threshold", 3.0)),
             max_lot_size=float(settings.get("max_lot_size", 0.1)),
@@ -134,10 +238,16 @@ class TradeExecutor:
         self._api_token = api_token
         self._settings = executor_settings
         self._is_multi_tenant = user_id is not None
+        # Log prefix and order comment prefix, formatted once
+        self._user_tag = f"[user:{user_id[:8]}] " if user_id else ""
+        # Include user_id in comment for trade tracking (multi-tenant only)
+        self._comment_prefix = f"U:{user_id[:8]} " if user_id else "Signal "
 
         self.api: Optional[MetaApi] = None
         self.account = None
         self.connection = None
+        self._handle: Optional[_connection_pool.ConnectionHandle] = None
+        self._symbol_cache: Dict[str, str] = {}  # signal symbol -> broker symbol
         self.last_error: Optional[str] = None  # Track last execution error
 
     def _get_config(self) -> dict:
@@ -168,98 +278,54 @@ class TradeExecutor:
         token = config.get("metaapi_token", "")
         if not token:
             raise ValueError("MetaApi Token not configured. Set it in Admin > System Config.")
+        # Remember it - reconnects shouldn't need another database round trip
+        self._api_token = token
         return token
 
     def _get_settings(self) -> ExecutorSettings:
-        """Get executor settings from config or database."""
-        if self._settings:
-            return self._settings
-        return ExecutorSettings.from_system_config()
+        """Get executor settings, reading them from the database at most once."""
+        if self._settings is None:
+            self._settings = ExecutorSettings.from_user_settings(self.user_id or SYSTEM_USER_ID)
+        return self._settings
+
+    def refresh_settings(self, executor_settings: Optional[ExecutorSettings] = None):
+        """Replace the cached executor settings.
 
-    def _get_user_tag(self) -> str:
-        """Get user tag for logging."""
-        return f"[user:{self.user_id[:8]}] " if self.user_id else ""
+        Args:
+            executor_settings: New settings, or None to re-read them from the
+                database on next use.
+        """
+        self._settings = executor_settings
+        # The suffix may have changed
+        self._symbol_cache.clear()
 
     async def connect(self, timeout_seconds: int = 300):
         """Connect to MetaApi and synchronize.
 
+        The RPC connection comes from a process-wide pool, so reconnecting
+        an account that was connected recently skips deploy and sync.
+
         Args:
             timeout_seconds: Maximum time to wait for connection (default 5 minutes).
                             MetaAPI recommends 300 seconds for synchronization.
         """
-        import asyncio
-
-        user_tag = self._get_user_tag()
-        log.info(f"{user_tag}Connecting to MetaApi...")
+        user_tag = self._user_tag
 
         # Get credentials dynamically from config/database
         api_token = self._get_api_token()
         account_id = self._get_account_id()
 
-        try:
-            self.api = MetaApi(api_token)
-            self.account = await self.api.metatrader_account_api.get_account(
-                account_id
-            )
-        except Exception as e:
-            error_msg = str(e)
-            if "not found" in error_msg.lower():
-                raise RuntimeError(f"MetaAPI account not found: {account_id[:8]}...")
-            raise RuntimeError(f"Failed to get MetaAPI account: {error_msg}")
-
-        # Deploy if needed
-        if self.account.state != "DEPLOYED":
-            log.info(f"{user_tag}Deploying MetaApi account (state: {self.account.state})...")
-            try:
-                await self.account.deploy()
-            except Exception as e:
-                log.warning(f"{user_tag}Deploy call returned error (may be already deploying): {e}")
-
-        # Wait for connection with timeout
-        log.info(f"{user_tag}Waiting for account connection (timeout: {timeout_seconds}s)...")
-        try:
-            await asyncio.wait_for(
-                self.account.wait_connected(),
-                timeout=timeout_seconds
-            )
-        except asyncio.TimeoutError:
-            # Check current state for better error message
-            try:
-                await self.account.reload()
-                state = self.account.state
-                connection_status = getattr(self.account, 'connection_status', 'unknown')
-            except Exception:
-                state = "unknown"
-                connection_status = "unknown"
-
-            raise RuntimeError(
-                f"Connection timed out after {timeout_seconds}s. "
-                f"Account state: {state}, connection: {connection_status}. "
-                "The broker may be slow or credentials may be incorrect."
-            )
-
-        # Get RPC connection
-        log.info(f"{user_tag}Getting RPC connection...")
-        self.connection = self.account.get_rpc_connection()
+        if self._handle:
+            # Reconnect - the previous connection is suspect, don't reuse it
+            await _connection_pool.discard(self._handle)
+            self._handle = None
 
-        try:
-            await self.connection.connect()
-        except Exception as e:
-            raise RuntimeError(f"Failed to establish RPC connection: {e}")
-
-        # Wait for synchronization with timeout
-        log.info(f"{user_tag}Waiting for synchronization...")
-        try:
-            await asyncio.wait_for(
-                self.connection.wait_synchronized(),
-                timeout=timeout_seconds
-            )
-        except asyncio.TimeoutError:
-            log.warning(
-                f"{user_tag}Synchronization timed out after {timeout_seconds}s, "
-                "but connection is established. Trading may work with limited data."
-            )
-            # Don't raise - connection might still be usable for trading
+        self._handle = await _connection_pool.get_connection(
+            api_token, account_id, timeout_seconds=timeout_seconds, user_tag=user_tag
+        )
+        self.api = self._handle.api
+        self.account = self._handle.account
+        self.connection = self._handle.rpc
 
         log.info(
             f"{user_tag}Connected to MetaApi",
@@ -276,8 +342,11 @@ class TradeExecutor:
         if not self.connection:
             raise RuntimeError("Not connected to MetaApi")
 
-        info = await self.connection.get_account_information()
-        positions = await self.connection.get_positions()
+        # Independent RPCs - fetch both in one round trip
+        info, positions = await asyncio.gather(
+            self.connection.get_account_information(),
+            self.connection.get_positions(),
+        )
 
         return {
             "balance": info.get("balance", 0),
@@ -312,49 +381,43 @@ class TradeExecutor:
         symbol_suffix = executor_settings.symbol_suffix
         base_symbol = signal.symbol
         
-        # Build list of symbols to try (with suffix first, then without)
-        symbols_to_try = []
-        if symbol_suffix:
-            symbols_to_try.append(base_symbol + symbol_suffix)  # Try with suffix first
-            symbols_to_try.append(base_symbol)  # Fallback to no suffix
-        else:
-            symbols_to_try.append(base_symbol)  # No suffix configured
-        
-        # Try each symbol variant until one works
-        broker_symbol = None
-        current_price = None
-        last_error_msg = None
-        
-        for try_symbol in symbols_to_try:
-            try:
-                price = await self.connection.get_symbol_price(try_symbol)
-                if price:
-                    broker_symbol = try_symbol
-                    current_price = price["ask"] if signal.direction == "BUY" else price["bid"]
-                    
-                    # Log if we used fallback
-                    if try_symbol != symbols_to_try[0]:
-                        user_tag = self._get_user_tag()
-                        log.info(f"{user_tag}Symbol fallback: '{symbols_to_try[0]}' not found, using '{try_symbol}'")
-                    break
-            except Exception as e:
-                last_error_msg = str(e)
-                continue
+        # Symbols to try: with suffix first, then without (fallback)
+        symbols_to_try = (
+            (base_symbol + symbol_suffix, base_symbol) if symbol_suffix else (base_symbol,)
+        )
         
+        # Resolved symbols are remembered, so repeat trades on a pair skip the
+        # variant probing; a failing cached symbol falls back to a full probe
+        broker_symbol = current_price = last_error_msg = None
+        cached_symbol = self._symbol_cache.get(base_symbol)
+        if cached_symbol:
+            broker_symbol, current_price, last_error_msg = await self._probe_symbol_price(
+                (cached_symbol,), signal.direction
+            )
+            if broker_symbol is None:
+                self._symbol_cache.pop(base_symbol, None)
+
+        if broker_symbol is None:
+            broker_symbol, current_price, last_error_msg = await self._probe_symbol_price(
+                symbols_to_try, signal.direction
+            )
+            if broker_symbol is not None:
+                self._symbol_cache[base_symbol] = broker_symbol
+                # Log if we used fallback
+                if broker_symbol != symbols_to_try[0]:
+                    user_tag = self._user_tag
+                    log.info(f"{user_tag}Symbol fallback: '{symbols_to_try[0]}' not found, using '{broker_symbol}'")
+
         # If no symbol worked, provide helpful error
         if broker_symbol is None or current_price is None:
             tried_symbols = "', '".join(symbols_to_try)
             
             # Check for weekend (forex/metals only)
-            from datetime import datetime
-            now_utc = datetime.utcnow()
-            weekday = now_utc.weekday()
-            is_weekend = weekday == 5 or weekday == 6 or (weekday == 4 and now_utc.hour >= 22)
+            now_utc = datetime.now(timezone.utc)
+            is_weekend = _WEEKEND_HOURS[now_utc.weekday() * 24 + now_utc.hour]
             
             # Check if likely crypto
-            symbol_upper = base_symbol.upper()
-            crypto_keywords = ["BTC", "ETH", "XRP", "LTC", "ADA", "DOT", "DOGE", "SOL", "MATIC", "AVAX", "LINK"]
-            is_crypto = any(kw in symbol_upper for kw in crypto_keywords)
+            is_crypto = _CRYPTO_RE.search(base_symbol.upper()) is not None
             
             if is_weekend and not is_crypto:
                 friendly_error = (
@@ -369,8 +432,11 @@ class TradeExecutor:
             self.last_error = friendly_error
             raise RuntimeError(friendly_error)
 
-        # Determine threshold for pending vs market order
+        # Pending vs market - the same for every TP leg
         threshold = self._get_price_threshold(signal.symbol)
+        order_type = self._get_order_type(
+            signal.direction, signal.entry_price, current_price, threshold
+        )
 
         # Use dynamic settings for split TPs
         split_tps = executor_settings.split_tps
@@ -392,40 +458,21 @@ class TradeExecutor:
             # Multiple TP orders
             if tp_lot_mode == "equal":
                 # EQUAL MODE: Each TP gets the FULL calculated lot size
-                for i, tp in enumerate(signal.take_profits):
-                    execution = await self._place_order(
-                        signal=signal,
-                        broker_symbol=broker_symbol,
-                        lot_size=lot_size,  # Full lot for each TP
-                        take_profit=tp,
-                        tp_index=i + 1,
-                        current_price=current_price,
-                        threshold=threshold,
-                    )
-                    if execution:
-                        executions.append(execution)
+                legs = [(lot_size, tp) for tp in signal.take_profits]
             else:
                 # SPLIT MODE (default): Divide lot across TPs using ratios
-                ratios = tp_ratios[: len(signal.take_profits)]
-                # Normalize ratios
-                total = sum(ratios)
-                ratios = [r / total for r in ratios]
-
-                for i, (tp, ratio) in enumerate(zip(signal.take_profits, ratios)):
-                    tp_lot = round(lot_size * ratio, 2)
-                    tp_lot = max(0.01, tp_lot)
-
-                    execution = await self._place_order(
-                        signal=signal,
-                        broker_symbol=broker_symbol,
-                        lot_size=tp_lot,
-                        take_profit=tp,
-                        tp_index=i + 1,
-                        current_price=current_price,
-                        threshold=threshold,
-                    )
-                    if execution:
-                        executions.append(execution)
+                ratios = executor_settings.split_ratios(len(signal.take_profits))
+                legs = [
+                    (max(0.01, round(lot_size * ratio, 2)), tp)
+                    for tp, ratio in zip(signal.take_profits, ratios)
+                ]
+
+            executions = await self._place_tp_orders(
+                signal=signal,
+                broker_symbol=broker_symbol,
+                legs=legs,
+                order_type=order_type,
+            )
         else:
             # Single order with TP1
             execution = await self._place_order(
@@ -434,12 +481,120 @@ class TradeExecutor:
                 lot_size=lot_size,
                 take_profit=signal.take_profits[0],
                 tp_index=1,
-                current_price=current_price,
-                threshold=threshold,
+                order_type=order_type,
             )
             if execution:
                 executions.append(execution)
 
+        if executions:
+            log.info(
+                f"{self._user_tag}Orders placed",
+                symbol=signal.symbol,
+                broker_symbol=broker_symbol,
+                direction=signal.direction,
+                type=order_type,
+                orders=[
+                    {"id": e.order_id, "tp_index": e.tp_index, "lot": e.lot_size, "tp": e.take_profit}
+                    for e in executions
+                ],
+            )
+
+        return executions
+
+    async def _probe_symbol_price(
+        self, symbols: Tuple[str, ...], direction: str
+    ) -> Tuple[Optional[str], Optional[float], Optional[str]]:
+        """Find the first symbol variant the broker quotes.
+
+        All variants are requested at once so a missing suffixed symbol doesn't
+        cost an extra round trip; they are still preferred in order.
+
+        Args:
+            symbols: Symbol variants in order of preference.
+            direction: BUY or SELL (picks ask or bid).
+
+        Returns:
+            (symbol, price, last_error) - symbol and price are None if no variant worked.
+        """
+        last_error_msg = None
+        # Long-term subscription: the terminal keeps this symbol's quotes
+        # streaming, so later signals on it get a price without a cold fetch
+        probes = [
+            asyncio.ensure_future(self.connection.get_symbol_price(symbol, keep_subscription=True))
+            for symbol in symbols
+        ]
+        try:
+            for symbol, probe in zip(symbols, probes):
+                try:
+                    price = await probe
+                except Exception as e:
+                    last_error_msg = str(e)
+                    continue
+                if price:
+                    _price_cache.record(self.connection, symbol, price)
+                    return symbol, (price["ask"] if direction == "BUY" else price["bid"]), last_error_msg
+        finally:
+            for probe in probes:
+                if not probe.done():
+                    probe.cancel()
+                elif not probe.cancelled():
+                    probe.exception()  # mark a losing probe's error as retrieved
+        return None, None, last_error_msg
+
+    async def _place_tp_orders(
+        self,
+        signal: ParsedSignal,
+        broker_symbol: str,
+        legs: List[Tuple[float, float]],
+        order_type: str,
+    ) -> List[TradeExecution]:
+        """Place one order per TP leg.
+
+        The legs are sent concurrently (at most _MAX_CONCURRENT_TP_ORDERS in
+        flight), so a split signal fills in about one round trip.
+
+        Args:
+            signal: Signal data.
+            broker_symbol: Symbol with broker suffix.
+            legs: (lot_size, take_profit) per TP, in TP order.
+            order_type: MetaApi order type shared by all legs.
+
+        Returns:
+            Successful executions, in TP order.
+        """
+        def place(tp_index: int, lot: float, tp: float):
+            return self._place_order(
+                signal=signal,
+                broker_symbol=broker_symbol,
+                lot_size=lot,
+                take_profit=tp,
+                tp_index=tp_index,
+                order_type=order_type,
+            )
+
+        # Some brokers throttle concurrent submissions - cap the fan-out
+        semaphore = asyncio.Semaphore(max(1, _MAX_CONCURRENT_TP_ORDERS))
+
+        async def place_limited(tp_index: int, lot: float, tp: float):
+            async with semaphore:
+                return await place(tp_index, lot, tp)
+
+        results = await asyncio.gather(
+            *(place_limited(i + 1, lot, tp) for i, (lot, tp) in enumerate(legs)),
+            return_exceptions=True,
+        )
+
+        executions = []
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                log.error(
+                    f"{self._user_tag}Order failed",
+                    error=str(result),
+                    symbol=signal.symbol,
+                    tp_index=i + 1,
+                )
+            elif result:
+                executions.append(result)
         return executions
 
     async def _place_order(
@@ -449,64 +604,36 @@ class TradeExecutor:
         lot_size: float,
         take_profit: float,
         tp_index: int,
-        current_price: float,
-        threshold: float,
+        order_type: str,
     ) -> Optional[TradeExecution]:
         """Place a single order.
 
+        Successful orders are not logged here; execute() logs the whole
+        signal in one line.
+
         Args:
             signal: Signal data.
             broker_symbol: Symbol with broker suffix.
             lot_size: Lot size for this order.
             take_profit: TP level for this order.
             tp_index: TP index (1, 2, 3...).
-            current_price: Current market price.
-            threshold: Price threshold for pending vs market.
+            order_type: MetaApi order type from _get_order_type().
 
         Returns:
             TradeExecution if successful, None otherwise.
         """
         try:
-            order_type = self._get_order_type(
-                signal.direction,
-                signal.entry_price,
-                current_price,
-                threshold,
-            )
+            comment = f"{self._comment_prefix}TP{tp_index}"
 
-            # Include user_id in comment for trade tracking (multi-tenant only)
-            if self.user_id:
-                comment = f"U:{self.user_id[:8]} TP{tp_index}"
-            else:
-                comment = f"Signal TP{tp_index}"
+            dispatch = _ORDER_DISPATCH.get(order_type)
+            if dispatch is None:
+                log.error("Unknown order type", order_type=order_type)
+                return None
 
-            if order_type == "ORDER_TYPE_BUY":
-                result = await self.connection.create_market_buy_order(
-                    broker_symbol,
-                    lot_size,
-                    signal.stop_loss,
-                    take_profit,
-                    {"comment": comment},
-                )
-            elif order_type == "ORDER_TYPE_SELL":
-                result = await self.connection.create_market_sell_order(
-                    broker_symbol,
-                    lot_size,
-                    signal.stop_loss,
-                    take_profit,
-                    {"comment": comment},
-                )
-            elif order_type == "ORDER_TYPE_BUY_LIMIT":
-                result = await self.connection.create_limit_buy_order(
-                    broker_symbol,
-                    lot_size,
-                    signal.entry_price,
-                    signal.stop_loss,
-                    take_profit,
-                    {"comment": comment},
-                )
-            elif order_type == "ORDER_TYPE_SELL_LIMIT":
-                result = await self.connection.create_limit_sell_order(
+            method_name, needs_entry = dispatch
+            create_order = getattr(self.connection, method_name)
+            if needs_entry:
+                result = await create_order(
                     broker_symbol,
                     lot_size,
                     signal.entry_price,
@@ -514,41 +641,17 @@ class TradeExecutor:
                     take_profit,
                     {"comment": comment},
                 )
-            elif order_type == "ORDER_TYPE_BUY_STOP":
-                result = await self.connection.create_stop_buy_order(
-                    broker_symbol,
-                    lot_size,
-                    signal.entry_price,
-                    signal.stop_loss,
-                    take_profit,
-                    {"comment": comment},
-                )
-            elif order_type == "ORDER_TYPE_SELL_STOP":
-                result = await self.connection.create_stop_sell_order(
+            else:
+                result = await create_order(
                     broker_symbol,
                     lot_size,
-                    signal.entry_price,
                     signal.stop_loss,
                     take_profit,
                     {"comment": comment},
                 )
-            else:
-                log.error("Unknown order type", order_type=order_type)
-                return None
 
             order_id = result.get("orderId") or result.get("positionId") or "unknown"
 
-            user_tag = self._get_user_tag()
-            log.info(
-                f"{user_tag}Order placed",
-                order_id=order_id,
-                symbol=signal.symbol,
-                direction=signal.direction,
-                lot=lot_size,
-                tp=take_profit,
-                type=order_type,
-            )
-
             return TradeExecution(
                 order_id=str(order_id),
                 symbol=signal.symbol,
@@ -561,7 +664,7 @@ class TradeExecutor:
             )
 
         except Exception as e:
-            user_tag = self._get_user_tag()
+            user_tag = self._user_tag
             error_msg = str(e)
             self.last_error = error_msg  # Store error for caller to retrieve
             log.error(
@@ -591,18 +694,9 @@ class TradeExecutor:
         Returns:
             MetaApi order type string.
         """
-        if direction == "BUY":
-            if entry_price < current_price - threshold:
-                return "ORDER_TYPE_BUY_LIMIT"
-            elif entry_price > current_price + threshold:
-                return "ORDER_TYPE_BUY_STOP"
-            return "ORDER_TYPE_BUY"
-        else:  # SELL
-            if entry_price > current_price + threshold:
-                return "ORDER_TYPE_SELL_LIMIT"
-            elif entry_price < current_price - threshold:
-                return "ORDER_TYPE_SELL_STOP"
-            return "ORDER_TYPE_SELL"
+        # -1: entry below the market band, 0: within it, +1: above it
+        position = (entry_price > current_price + threshold) - (entry_price < current_price - threshold)
+        return _ORDER_TYPES[direction != "BUY"][position + 1]
 
     def _get_price_threshold(self, symbol: str) -> float:
         """Get price threshold for determining order type.
@@ -617,17 +711,12 @@ class TradeExecutor:
             Price threshold value.
         """
         symbol = symbol.upper()
-        if "JPY" in symbol:
-            return 0.05
-        elif symbol in ["XAUUSD", "GOLD"]:
+        if symbol in _GOLD_SYMBOLS:
             # Smart execution: use configurable threshold (default $3)
             # This means if price is within $3 of entry, use market order
             executor_settings = self._get_settings()
             return executor_settings.gold_market_threshold
-        elif symbol in ["DJ30", "US30", "USTEC", "NAS100"]:
-            return 10.0
-        else:
-            return 0.0005
+        return _static_price_threshold(symbol)
 
     async def modify_position_sl(self, position_id: str, new_sl: float):
         """Modify stop loss for a position (for breakeven).
@@ -639,7 +728,7 @@ class TradeExecutor:
         if not self.connection:
             raise RuntimeError("Not connected to MetaApi")
 
-        user_tag = self._get_user_tag()
+        user_tag = self._user_tag
         try:
             await self.connection.modify_position(
                 position_id=position_id,
@@ -662,7 +751,7 @@ class TradeExecutor:
         if not self.connection:
             raise RuntimeError("Not connected to MetaApi")
 
-        user_tag = self._get_user_tag()
+        user_tag = self._user_tag
         try:
             await self.connection.close_position(position_id=position_id)
             log.info(f"{user_tag}Position closed", position_id=position_id)
@@ -673,6 +762,46 @@ class TradeExecutor:
                 position_id=position_id,
             )
 
+    async def close_positions(self, position_ids: List[str]) -> List[str]:
+        """Close several positions concurrently.
+
+        At most _POSITION_BATCH_CONCURRENCY closes are in flight; repeated
+        IDs are closed once. Logs one line for the successes and one for
+        the failures.
+
+        Args:
+            position_ids: Position IDs to close.
+
+        Returns:
+            IDs of the positions that were closed.
+        """
+        if not self.connection:
+            raise RuntimeError("Not connected to MetaApi")
+
+        position_ids = list(dict.fromkeys(position_ids))
+        semaphore = asyncio.Semaphore(_POSITION_BATCH_CONCURRENCY)
+
+        async def close(position_id: str):
+            async with semaphore:
+                return await self.connection.close_position(position_id=position_id)
+
+        results = await asyncio.gather(*(close(p) for p in position_ids), return_exceptions=True)
+
+        succeeded = []
+        failed = {}
+        for position_id, result in zip(position_ids, results):
+            if isinstance(result, Exception):
+                failed[position_id] = str(result)
+            else:
+                succeeded.append(position_id)
+
+        user_tag = self._user_tag
+        if succeeded:
+            log.info(f"{user_tag}Positions closed", position_ids=succeeded)
+        if failed:
+            log.error(f"{user_tag}Failed to close positions", errors=failed)
+        return succeeded
+
     async def get_deals_by_position(self, position_id: str) -> List[Dict[str, Any]]:
         """Get deal history for a position to retrieve close price/profit.
 
@@ -685,7 +814,7 @@ class TradeExecutor:
         if not self.connection:
             raise RuntimeError("Not connected to MetaApi")
 
-        user_tag = self._get_user_tag()
+        user_tag = self._user_tag
         try:
             result = await self.connection.get_deals_by_position(position_id)
             # MetaApi returns {'deals': [...], 'synchronizing': bool}
@@ -718,7 +847,7 @@ class TradeExecutor:
         if not self.connection:
             raise RuntimeError("Not connected to MetaApi")
 
-        user_tag = self._get_user_tag()
+        user_tag = self._user_tag
         try:
             result = await self.connection.get_deals_by_time_range(
                 start_time=start_time, end_time=end_time
@@ -745,7 +874,7 @@ class TradeExecutor:
         Returns:
             Today's total realized P&L.
         """
-        user_tag = self._get_user_tag()
+        user_tag = self._user_tag
         try:
             # Get today's start (midnight UTC)
             now = datetime.utcnow()
@@ -773,12 +902,22 @@ class TradeExecutor:
             log.warning(f"{user_tag}Failed to get today's P&L", error=str(e))
             return 0.0
 
-    async def disconnect(self):
-        """Disconnect from MetaApi."""
-        user_tag = self._get_user_tag()
-        if self.connection:
-            try:
-                await self.connection.close()
-                log.info(f"{user_tag}Disconnected from MetaApi")
-            except Exception as e:
-                log.error(f"{user_tag}Error disconnecting", error=str(e))
+    async def disconnect(self, discard: bool = False):
+        """Disconnect from MetaApi.
+
+        Releases the pooled connection; the pool closes it once idle.
+
+        Args:
+            discard: Close the connection now and drop it from the pool, so
+                the next connect() builds a fresh one (forced reconnect,
+                failed connect).
+        """
+        user_tag = self._user_tag
+        if self._handle:
+            if discard:
+                await _connection_pool.discard(self._handle)
+            else:
+                _connection_pool.release(self._handle)
+            self._handle = None
+            self.connection = None
+            log.info(f"{user_tag}Disconnected from MetaApi")
@@ -1,10 +1,147 @@
 """Trade validation before execution."""
-from typing import Optional, Dict, Any, List
+import asyncio
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
 
 from ..parser.models import ParsedSignal, ValidationResult
 from ..config import settings as static_settings  # Keep for non-overridable settings
 from ..database.supabase import get_settings
+from ..database.cache import validator_settings_cache
 from ..utils.logger import log
+from . import _price_cache
+
+_GOLD_SYMBOLS = frozenset({"XAUUSD", "GOLD"})
+
+# Upper-cased symbol -> pip size / approximate USD pip value per lot.
+# JPY pairs are matched separately; anything else is a standard forex pair.
+_PIP_SIZES = {
+    "XAUUSD": 0.1,
+    "GOLD": 0.1,
+    "DJ30": 1.0,
+    "US30": 1.0,
+    "USTEC": 1.0,
+    "NAS100": 1.0,
+}
+_PIP_VALUES_PER_LOT = {
+    "XAUUSD": 1.0,  # $1 per 0.1 move per 0.01 lot
+    "GOLD": 1.0,
+    "DJ30": 1.0,  # Index
+    "US30": 1.0,
+    "USTEC": 1.0,
+    "NAS100": 1.0,
+}
+
+
+def _index_positions(positions: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Group open positions' upper-cased types by symbol, without repeats.
+
+    Args:
+        positions: Open positions from account info.
+
+    Returns:
+        Symbol -> distinct position types, in first-seen order.
+    """
+    index: Dict[str, List[str]] = {}
+    for pos in positions:
+        types = index.setdefault(pos.get("symbol", ""), [])
+        pos_type = pos.get("type", "").upper()
+        if pos_type not in types:
+            types.append(pos_type)
+    return index
+
+
+def _risk_adjusted_lot(
+    symbol: str,
+    entry_price: float,
+    stop_loss: float,
+    balance: float,
+    max_risk_percent: float,
+    reference_lot: float,
+    max_lot: float,
+) -> Tuple[float, Optional[str]]:
+    """Size a trade from risk, with the reference lot as the floor.
+
+    Formula: lot = (balance * risk%) / (SL_pips * pip_value_per_lot); the
+    LARGER of that and the reference lot is used, capped at max_lot.
+    Pure arithmetic, so it can be reused for batch sizing.
+
+    Args:
+        symbol: Trading symbol.
+        entry_price: Signal entry price.
+        stop_loss: Signal stop loss.
+        balance: Account balance.
+        max_risk_percent: Max risk per trade, in percent of balance.
+        reference_lot: Balance-scaled reference lot (minimum floor).
+        max_lot: Maximum allowed lot size.
+
+    Returns:
+        (lot size, warning message or None).
+    """
+    adjusted_lot_size = reference_lot  # Start with reference as floor
+    warning = None
+
+    if balance > 0:
+        # Approximate pip value per lot (varies by pair and account currency)
+        pip_value, pip_value_per_lot = _pip_info(symbol)
+        sl_pips = abs(entry_price - stop_loss) / pip_value
+
+        max_risk_amount = balance * (max_risk_percent / 100)
+        risk_per_lot = sl_pips * pip_value_per_lot
+
+        if risk_per_lot > 0:
+            risk_based_lot = round(max_risk_amount / risk_per_lot, 2)
+
+            # Use the LARGER of risk-based or reference (reference is minimum)
+            if risk_based_lot > reference_lot:
+                adjusted_lot_size = risk_based_lot
+                warning = f"Lot size {adjusted_lot_size} (risk-based: {max_risk_percent}% of ${balance:.0f})"
+            else:
+                # Risk calculation would give smaller lot, but we use reference as floor
+                actual_risk = (reference_lot * risk_per_lot / balance) * 100
+                if actual_risk > max_risk_percent:
+                    warning = f"Using minimum lot {reference_lot} (actual risk: {actual_risk:.1f}%)"
+
+    # Ensure lot size is within bounds
+    return _clamp(adjusted_lot_size, 0.01, max_lot), warning
+
+
+@lru_cache(maxsize=256)
+def _pip_info(symbol: str) -> Tuple[float, float]:
+    """Get (pip size, approximate USD pip value per lot) for a symbol.
+
+    Args:
+        symbol: Trading symbol, any case.
+
+    Returns:
+        Pip size and pip value per standard lot.
+    """
+    symbol = symbol.upper()
+    if "JPY" in symbol:
+        return 0.01, 7.5  # Approximate for JPY pairs
+    # Standard forex pairs: 0.0001 pip, ~$10 per pip per lot
+    return _PIP_SIZES.get(symbol, 0.0001), _PIP_VALUES_PER_LOT.get(symbol, 10.0)
+
+
+@lru_cache(maxsize=512)
+def _broker_symbol(symbol: str, suffix: str) -> str:
+    """Append the broker suffix, reusing one string per (symbol, suffix) pair.
+
+    Args:
+        symbol: Signal symbol.
+        suffix: Broker symbol suffix, may be empty.
+
+    Returns:
+        Broker symbol.
+    """
+    return symbol + suffix if suffix else symbol
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    """Bound value to [low, high]; low wins if the bounds cross, like max(low, min(value, high))."""
+    if value > high:
+        value = high
+    return low if value < low else value
 
 
 def get_reference_lot_for_symbol(symbol: str, db_settings: dict = None) -> float:
@@ -19,17 +156,14 @@ def get_reference_lot_for_symbol(symbol: str, db_settings: dict = None) -> float
     Returns:
         Reference lot size for the symbol.
     """
-    symbol_upper = symbol.upper()
+    # Only read the setting that applies to this symbol
+    if symbol.upper() in _GOLD_SYMBOLS:
+        if db_settings:
+            return db_settings.get("lot_reference_size_gold", 0.04)
+        return static_settings.lot_reference_size
     if db_settings:
-        gold_ref = db_settings.get("lot_reference_size_gold", 0.04)
-        default_ref = db_settings.get("lot_reference_size_default", 0.01)
-    else:
-        gold_ref = static_settings.lot_reference_size
-        default_ref = static_settings.lot_reference_size_default
-    
-    if symbol_upper in ["XAUUSD", "GOLD"]:
-        return gold_ref
-    return default_ref
+        return db_settings.get("lot_reference_size_default", 0.01)
+    return static_settings.lot_reference_size_default
 
 
 def calculate_dynamic_lot_size(
@@ -57,7 +191,7 @@ def calculate_dynamic_lot_size(
         return min_lot
 
     calculated = (account_balance / reference_balance) * reference_lot
-    return max(min_lot, min(round(calculated, 2), max_lot))
+    return _clamp(round(calculated, 2), min_lot, max_lot)
 
 
 def calculate_lot_for_symbol(
@@ -92,6 +226,98 @@ def calculate_lot_for_symbol(
     )
 
 
+@dataclass(slots=True, frozen=True)
+class ValidatorSettings:
+    """The user settings the validator reads, with defaults applied once."""
+    max_lot_size: float = 0.1
+    max_risk_percent: float = 2.0
+    max_open_trades: int = 5
+    symbol_suffix: str = ""
+    lot_reference_balance: float = 500.0
+    lot_reference_size_gold: float = 0.04
+    lot_reference_size_default: float = 0.01
+
+    @classmethod
+    def from_dict(cls, db_settings: Dict[str, Any]) -> "ValidatorSettings":
+        """Create ValidatorSettings from a get_settings() dict.
+
+        Args:
+            db_settings: User settings dict from database.
+
+        Returns:
+            ValidatorSettings with missing keys set to their defaults.
+        """
+        return cls(
+            max_lot_size=db_settings.get("max_lot_size", 0.1),
+            max_risk_percent=db_settings.get("max_risk_percent", 2.0),
+            max_open_trades=db_settings.get("max_open_trades", 5),
+            symbol_suffix=db_settings.get("symbol_suffix", ""),
+            lot_reference_balance=db_settings.get("lot_reference_balance", 500.0),
+            lot_reference_size_gold=db_settings.get("lot_reference_size_gold", 0.04),
+            lot_reference_size_default=db_settings.get("lot_reference_size_default", 0.01),
+        )
+
+    @classmethod
+    def for_user(cls, user_id: str) -> "ValidatorSettings":
+        """Get a user's ValidatorSettings, cached until their settings change.
+
+        Args:
+            user_id: User whose settings to read.
+
+        Returns:
+            ValidatorSettings for the user.
+        """
+        hit, validator_settings = validator_settings_cache.get(user_id)
+        if not hit:
+            validator_settings = cls.from_dict(get_settings(user_id))
+            validator_settings_cache.set(user_id, validator_settings)
+        return validator_settings
+
+    def reference_lot(self, symbol: str) -> float:
+        """Get the reference lot size for a symbol (see get_reference_lot_for_symbol).
+
+        Args:
+            symbol: Trading symbol.
+
+        Returns:
+            Reference lot size for the symbol.
+        """
+        if symbol.upper() in _GOLD_SYMBOLS:
+            return self.lot_reference_size_gold
+        return self.lot_reference_size_default
+
+
+@lru_cache(maxsize=256)
+def _reference_lot_size(
+    symbol: str,
+    balance: float,
+    max_lot: float,
+    validator_settings: ValidatorSettings,
+) -> float:
+    """Balance-scaled reference lot, memoized.
+
+    Balance only moves when trades close, so consecutive signals usually
+    repeat the same arguments. The settings instance is part of the key,
+    so a settings change is a cache miss rather than a stale hit.
+
+    Args:
+        symbol: Trading symbol.
+        balance: Account balance.
+        max_lot: Maximum allowed lot size.
+        validator_settings: User settings the reference lot comes from.
+
+    Returns:
+        Reference lot size, bounded by 0.01 and max_lot.
+    """
+    return calculate_dynamic_lot_size(
+        account_balance=balance,
+        reference_balance=validator_settings.lot_reference_balance,
+        reference_lot=validator_settings.reference_lot(symbol),
+        min_lot=0.01,
+        max_lot=max_lot,
+    )
+
+
 class TradeValidator:
     """Validate signals before execution."""
 
@@ -119,40 +345,128 @@ class TradeValidator:
         Returns:
             ValidationResult with pass/fail status and any errors/warnings.
         """
-        errors: List[str] = []
-        warnings: List[str] = []
-
         # Fetch current settings from database for THIS user (multi-tenant)
         if not self.user_id:
             log.error("TradeValidator has no user_id - cannot fetch settings")
-            return ValidationResult(valid=False, errors=["No user context for validation"])
+            return ValidationResult(passed=False, errors=["No user context for validation"])
+
+        db_settings = ValidatorSettings.for_user(self.user_id)
 
-        db_settings = get_settings(self.user_id)
-        max_lot_size = db_settings.get("max_lot_size", 0.1)
-        max_open_trades = db_settings.get("max_open_trades", 5)
-        max_risk_percent = db_settings.get("max_risk_percent", 2.0)
-        symbol_suffix = db_settings.get("symbol_suffix", "")
+        # Rejections need no price - skip the round trip for them
+        errors = self._hard_errors(signal, account_info, db_settings)
+        if errors:
+            return ValidationResult(passed=False, errors=errors)
+
+        price = None
+        if self.connection:
+            broker_symbol = _broker_symbol(signal.symbol, db_settings.symbol_suffix)
+            price = (await self._fetch_prices([broker_symbol]))[broker_symbol]
+        return self._check(
+            signal, account_info, db_settings, price,
+            _index_positions(account_info.get("positions", [])),
+        )
+
+    async def validate_batch(
+        self,
+        signals: List[ParsedSignal],
+        account_info: Dict[str, Any],
+    ) -> List[ValidationResult]:
+        """Validate several signals against the same account snapshot.
+
+        Settings are read once and each distinct symbol's price is fetched
+        once, all concurrently.
+
+        Args:
+            signals: Parsed signals to validate.
+            account_info: Current account information.
+
+        Returns:
+            One ValidationResult per signal, in order.
+        """
+        if not self.user_id:
+            log.error("TradeValidator has no user_id - cannot fetch settings")
+            return [
+                ValidationResult(passed=False, errors=["No user context for validation"])
+                for _ in signals
+            ]
+
+        db_settings = ValidatorSettings.for_user(self.user_id)
+        symbol_suffix = db_settings.symbol_suffix
+        hard_errors = [self._hard_errors(signal, account_info, db_settings) for signal in signals]
+
+        # Only fetch prices for signals that can still pass
+        prices = {}
+        if self.connection:
+            prices = await self._fetch_prices(list({
+                _broker_symbol(signal.symbol, symbol_suffix)
+                for signal, errors in zip(signals, hard_errors)
+                if not errors
+            }))
+
+        # One pass over the positions serves every signal's duplicate check
+        positions_by_symbol = _index_positions(account_info.get("positions", []))
+        return [
+            ValidationResult(passed=False, errors=errors) if errors else self._check(
+                signal, account_info, db_settings, prices.get(_broker_symbol(signal.symbol, symbol_suffix)),
+                positions_by_symbol,
+            )
+            for signal, errors in zip(signals, hard_errors)
+        ]
+
+    async def _fetch_prices(self, broker_symbols: List[str]) -> Dict[str, Any]:
+        """Fetch prices for several symbols concurrently.
+
+        A quote seen in the last couple of seconds (e.g. by the executor)
+        is reused instead of another round trip.
+
+        Args:
+            broker_symbols: Symbols with broker suffix.
+
+        Returns:
+            Symbol -> price dict, or the exception if that fetch failed.
+        """
+        results = await asyncio.gather(
+            *(_price_cache.get_symbol_price(self.connection, symbol) for symbol in broker_symbols),
+            return_exceptions=True,
+        )
+        return dict(zip(broker_symbols, results))
+
+    def _check(
+        self,
+        signal: ParsedSignal,
+        account_info: Dict[str, Any],
+        db_settings: ValidatorSettings,
+        price: Any,
+        positions_by_symbol: Dict[str, List[str]],
+    ) -> ValidationResult:
+        """Run the price, risk and duplicate checks for a signal that passed _hard_errors().
+
+        Args:
+            signal: Parsed signal to validate.
+            account_info: Current account information.
+            db_settings: User settings.
+            price: Symbol price, the exception from fetching it, or None if
+                no price was fetched.
+            positions_by_symbol: Open position types per symbol, from
+                _index_positions().
+
+        Returns:
+            Passing ValidationResult with the adjusted lot size and any warnings.
+        """
+        warnings: List[str] = []
+
+        max_lot_size = db_settings.max_lot_size
 
         # Calculate reference-based lot size (this is the MINIMUM floor)
         # Scales linearly with balance: (balance / ref_balance) * ref_lot
         balance = account_info.get("balance", 0)
-        reference_lot_size = calculate_lot_for_symbol(
-            symbol=signal.symbol,
-            account_balance=balance,
-            min_lot=0.01,
-            max_lot=max_lot_size,
-            db_settings=db_settings,
-        )
-
-        # 1. Symbol whitelist check (still use static config for this)
-        if static_settings.symbol_whitelist and signal.symbol not in static_settings.symbol_whitelist:
-            errors.append(f"Symbol {signal.symbol} not in allowed list")
+        reference_lot_size = _reference_lot_size(signal.symbol, balance, max_lot_size, db_settings)
 
         # 2. Get current price and validate entry
-        broker_symbol = signal.symbol + symbol_suffix
-        if self.connection:
+        if price is not None:
             try:
-                price = await self.connection.get_symbol_price(broker_symbol)
+                if isinstance(price, Exception):
+                    raise price
                 current_price = (
                     price["bid"] if signal.direction == "SELL" else price["ask"]
                 )
@@ -168,6 +482,7 @@ class TradeValidator:
                     )
             except Exception as e:
                 # Price fetch failure is a warning, not an error - allow trade to proceed
+                broker_symbol = _broker_symbol(signal.symbol, db_settings.symbol_suffix)
                 warnings.append(f"Could not fetch price for {broker_symbol}: {str(e)}")
 
         # 3. Stop loss distance check
@@ -180,41 +495,59 @@ class TradeValidator:
             )
 
         # 4. Risk-based lot calculation with reference lot as minimum floor
-        # Formula: lot = (balance * risk%) / (SL_pips * pip_value_per_lot)
-        # Use the LARGER of risk-based or reference lot (but capped at max)
-        adjusted_lot_size = reference_lot_size  # Start with reference as floor
+        adjusted_lot_size, risk_warning = _risk_adjusted_lot(
+            signal.symbol,
+            signal.entry_price,
+            signal.stop_loss,
+            balance,
+            db_settings.max_risk_percent,
+            reference_lot_size,
+            max_lot_size,
+        )
+        if risk_warning:
+            warnings.append(risk_warning)
 
-        if balance > 0:
-            pip_value = self._get_pip_value(signal.symbol)
-            sl_pips = abs(signal.entry_price - signal.stop_loss) / pip_value
+        # 6. Duplicate position check
+        for pos_type in positions_by_symbol.get(signal.symbol, ()):
+            if pos_type == signal.direction:
+                warnings.append(
+                    f"Already have {signal.direction} position on {signal.symbol}"
+                )
+            else:
+                warnings.append(
+                    f"Have opposite {pos_type} position on {signal.symbol}"
+                )
 
-            max_risk_amount = balance * (max_risk_percent / 100)
-            # Approximate pip value per lot (varies by pair and account currency)
-            pip_value_per_lot = self._estimate_pip_value_per_lot(signal.symbol)
-            risk_per_lot = sl_pips * pip_value_per_lot
+        return ValidationResult(
+            passed=True,
+            warnings=warnings,
+            adjusted_lot_size=adjusted_lot_size,
+        )
 
-            if risk_per_lot > 0:
-                risk_based_lot = round(max_risk_amount / risk_per_lot, 2)
+    def _hard_errors(
+        self,
+        signal: ParsedSignal,
+        account_info: Dict[str, Any],
+        db_settings: ValidatorSettings,
+    ) -> List[str]:
+        """Run the checks that reject a signal outright; none need a price.
 
-                # Use the LARGER of risk-based or reference (reference is minimum)
-                if risk_based_lot > reference_lot_size:
-                    adjusted_lot_size = risk_based_lot
-                    warnings.append(
-                        f"Lot size {adjusted_lot_size} (risk-based: {max_risk_percent}% of ${balance:.0f})"
-                    )
-                else:
-                    # Risk calculation would give smaller lot, but we use reference as floor
-                    adjusted_lot_size = reference_lot_size
-                    actual_risk = (reference_lot_size * risk_per_lot / balance) * 100
-                    if actual_risk > max_risk_percent:
-                        warnings.append(
-                            f"Using minimum lot {reference_lot_size} (actual risk: {actual_risk:.1f}%)"
-                        )
-
-        # Ensure lot size is within bounds
-        adjusted_lot_size = max(0.01, min(adjusted_lot_size, max_lot_size))
+        Args:
+            signal: Parsed signal to validate.
+            account_info: Current account information.
+            db_settings: User settings.
+
+        Returns:
+            Error messages, empty if the signal may proceed.
+        """
+        errors: List[str] = []
+
+        # 1. Symbol whitelist check (still use static config for this)
+        if static_settings.symbol_whitelist and signal.symbol not in static_settings.symbol_whitelist:
+            errors.append(f"Symbol {signal.symbol} not in allowed list")
 
         # 5. Position limit check
+        max_open_trades = db_settings.max_open_trades
         open_positions = account_info.get("positions", [])
         if len(open_positions) >= max_open_trades:
             errors.append(
@@ -222,20 +555,6 @@ class TradeValidator:
                 f"currently have {len(open_positions)}"
             )
 
-        # 6. Duplicate position check
-        for pos in open_positions:
-            pos_symbol = pos.get("symbol", "")
-            pos_type = pos.get("type", "").upper()
-            if pos_symbol == signal.symbol:
-                if pos_type == signal.direction:
-                    warnings.append(
-                        f"Already have {signal.direction} position on {signal.symbol}"
-                    )
-                else:
-                    warnings.append(
-                        f"Have opposite {pos_type} position on {signal.symbol}"
-                    )
-
         # 7. Confidence check
         if signal.confidence < 0.6:
             errors.append(f"Signal confidence too low: {signal.confidence:.2f}")
@@ -244,22 +563,15 @@ class TradeValidator:
         if signal.direction == "BUY":
             if signal.stop_loss >= signal.entry_price:
                 errors.append("BUY signal: SL must be below entry price")
-            if any(tp <= signal.entry_price for tp in signal.take_profits):
+            if signal.take_profits and min(signal.take_profits) <= signal.entry_price:
                 errors.append("BUY signal: All TPs must be above entry price")
         else:  # SELL
             if signal.stop_loss <= signal.entry_price:
                 errors.append("SELL signal: SL must be above entry price")
-            if any(tp >= signal.entry_price for tp in signal.take_profits):
+            if signal.take_profits and max(signal.take_profits) >= signal.entry_price:
                 errors.append("SELL signal: All TPs must be below entry price")
 
-        passed = len(errors) == 0
-
-        return ValidationResult(
-            passed=passed,
-            errors=errors,
-            warnings=warnings,
-            adjusted_lot_size=adjusted_lot_size if passed else None,
-        )
+        return errors
 
     def _get_pip_value(self, symbol: str) -> float:
         """Get pip size for a symbol.
@@ -270,15 +582,7 @@ class TradeValidator:
         Returns:
             Pip size (e.g., 0.0001 for EURUSD, 0.01 for USDJPY).
         """
-        symbol = symbol.upper()
-        if "JPY" in symbol:
-            return 0.01
-        elif symbol in ["XAUUSD", "GOLD"]:
-            return 0.1
-        elif symbol in ["DJ30", "US30", "USTEC", "NAS100"]:
-            return 1.0
-        else:
-            return 0.0001
+        return _pip_info(symbol)[0]
 
     def _estimate_pip_value_per_lot(self, symbol: str) -> float:
         """Estimate pip value per standard lot in USD.
@@ -289,14 +593,4 @@ class TradeValidator:
         Returns:
             Approximate pip value per lot.
         """
-        symbol = symbol.upper()
-        if "JPY" in symbol:
-            return 7.5  # Approximate for JPY pairs
-        elif symbol in ["XAUUSD", "GOLD"]:
-            return 1.0  # $1 per 0.1 move per 0.01 lot
-        elif symbol in ["DJ30", "US30"]:
-            return 1.0  # Index
-        elif symbol in ["USTEC", "NAS100"]:
-            return 1.0  # Index
-        else:
-            return 10.0  # Standard forex pairs ~$10 per pip per lot
+        return _pip_info(symbol)[1]
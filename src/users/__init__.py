@@ -1,6 +1,6 @@
 """User management module for multi-tenant operations."""
 from .manager import UserConnectionManager, user_manager
-from .credentials import get_user_credentials, update_user_credentials
+from .credentials import get_user_credentials, get_user_profile, update_user_credentials
 from .mt_accounts import (
     MTAccount,
     get_user_mt_accounts,
@@ -16,6 +16,7 @@ __all__ = [
     "UserConnectionManager",
     "user_manager",
     "get_user_credentials",
+    "get_user_profile",
     "update_user_credentials",
     "MTAccount",
     "get_user_mt_accounts",
@@ -1,14 +1,32 @@
 """User credentials management with Supabase."""
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from dataclasses import dataclass
 
+from ..database import cache
 from ..database.supabase import get_supabase_admin
 from ..utils.logger import log
 
-
-@dataclass
+# Columns the dataclasses below are built from - select("*") would also ship
+# columns nothing reads. The get_user_profile function (migration 011)
+# returns the same columns.
+_CREDENTIALS_COLUMNS = (
+    "telegram_api_id,telegram_api_hash,telegram_phone,telegram_session_encrypted,"
+    "telegram_connected,mt_login,mt_server,mt_platform,metaapi_account_id,mt_connected"
+)
+_SETTINGS_COLUMNS = (
+    "max_risk_percent,max_lot_size,max_open_trades,lot_reference_balance,"
+    "lot_reference_size_gold,lot_reference_size_default,auto_accept_symbols,"
+    "gold_market_threshold,split_tps,tp_split_ratios,tp_lot_mode,enable_breakeven,"
+    "symbol_suffix,telegram_channel_ids,paused"
+)
+
+
+@dataclass(slots=True, frozen=True)
 class UserCredentials:
-    """User credentials for Telegram and MetaTrader."""
+    """User credentials for Telegram and MetaTrader.
+
+    Immutable, so one cached instance can be shared by every caller.
+    """
 
     user_id: str
 
@@ -37,7 +55,7 @@ class UserCredentials:
         return bool(self.mt_login and self.mt_server)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UserSettings:
     """User trading settings."""
 
@@ -71,42 +89,56 @@ class UserSettings:
     paused: bool = False
 
     def __post_init__(self):
+        # Frozen dataclass - defaults have to bypass __setattr__
         if self.auto_accept_symbols is None:
-            self.auto_accept_symbols = ["XAUUSD", "GOLD"]
+            object.__setattr__(self, "auto_accept_symbols", ["XAUUSD", "GOLD"])
         if self.tp_split_ratios is None:
-            self.tp_split_ratios = [0.5, 0.3, 0.2]
+            object.__setattr__(self, "tp_split_ratios", [0.5, 0.3, 0.2])
         if self.telegram_channel_ids is None:
-            self.telegram_channel_ids = []
+            object.__setattr__(self, "telegram_channel_ids", [])
+
+
+def _credentials_from_row(user_id: str, data: Dict[str, Any]) -> UserCredentials:
+    """Build UserCredentials from a user_credentials row."""
+    return UserCredentials(
+        user_id=user_id,
+        telegram_api_id=data.get("telegram_api_id"),
+        telegram_api_hash=data.get("telegram_api_hash"),
+        telegram_phone=data.get("telegram_phone"),
+        telegram_session_encrypted=data.get("telegram_session_encrypted"),
+        telegram_connected=data.get("telegram_connected", False),
+        mt_login=data.get("mt_login"),
+        mt_server=data.get("mt_server"),
+        mt_platform=data.get("mt_platform", "mt5"),
+        metaapi_account_id=data.get("metaapi_account_id"),
+        mt_connected=data.get("mt_connected", False),
+    )
 
 
 def get_user_credentials(user_id: str) -> Optional[UserCredentials]:
     """Get user credentials from Supabase.
 
+    Found rows are cached for a short TTL; update_user_credentials() drops
+    the cached copy.
+
     Args:
         user_id: User UUID.
 
     Returns:
         UserCredentials object or None if not found.
     """
+    hit, cached = cache.credentials_cache.get(user_id)
+    if hit:
+        return cached
+
     try:
         supabase = get_supabase_admin()
-        result = supabase.table("user_credentials").select("*").eq("user_id", user_id).execute()
+        result = supabase.table("user_credentials").select(_CREDENTIALS_COLUMNS).eq("user_id", user_id).execute()
 
         if result.data and len(result.data) > 0:
-            data = result.data[0]
-            return UserCredentials(
-                user_id=user_id,
-                telegram_api_id=data.get("telegram_api_id"),
-                telegram_api_hash=data.get("telegram_api_hash"),
-                telegram_phone=data.get("telegram_phone"),
-                telegram_session_encrypted=data.get("telegram_session_encrypted"),
-                telegram_connected=data.get("telegram_connected", False),
-                mt_login=data.get("mt_login"),
-                mt_server=data.get("mt_server"),
-                mt_platform=data.get("mt_platform", "mt5"),
-                metaapi_account_id=data.get("metaapi_account_id"),
-                mt_connected=data.get("mt_connected", False),
-            )
+            creds = _credentials_from_row(user_id, result.data[0])
+            cache.credentials_cache.set(user_id, creds)
+            return creds
         return None
     except Exception as e:
         log.error("Error getting user credentials", user_id=user_id, error=str(e))
@@ -132,9 +164,13 @@ def update_user_credentials(user_id: str, updates: Dict[str, Any]) -> bool:
         if not filtered_updates:
             return True
 
-        result = supabase.table("user_credentials").update(filtered_updates).eq("user_id", user_id).execute()
+        # return=minimal: no row body back, the exact count says whether a row matched
+        result = supabase.table("user_credentials").update(
+            filtered_updates, count="exact", returning="minimal"
+        ).eq("user_id", user_id).execute()
+        cache.credentials_cache.invalidate(user_id)
 
-        success = bool(result.data)
+        success = bool(result.count)
         if success:
             log.info("User credentials updated", user_id=user_id, fields=list(filtered_updates.keys()))
         else:
@@ -145,39 +181,58 @@ def update_user_credentials(user_id: str, updates: Dict[str, Any]) -> bool:
         return False
 
 
+def _copy_list(value: Any) -> Any:
+    """Shallow-copy a list value so callers can't mutate a cached row."""
+    return list(value) if isinstance(value, list) else value
+
+
+def _user_settings_from_row(user_id: str, data: Dict[str, Any]) -> UserSettings:
+    """Build UserSettings from a user_settings_v2 row, applying defaults."""
+    return UserSettings(
+        user_id=user_id,
+        max_risk_percent=float(data.get("max_risk_percent") or 2.0),
+        max_lot_size=float(data.get("max_lot_size") or 0.1),
+        max_open_trades=int(data.get("max_open_trades") or 5),
+        lot_reference_balance=float(data.get("lot_reference_balance") or 500.0),
+        lot_reference_size_gold=float(data.get("lot_reference_size_gold") or 0.04),
+        lot_reference_size_default=float(data.get("lot_reference_size_default") or 0.01),
+        # Lists are copied - the row may be shared with the settings cache
+        auto_accept_symbols=_copy_list(data.get("auto_accept_symbols") or ["XAUUSD", "GOLD"]),
+        gold_market_threshold=float(data.get("gold_market_threshold") or 3.0),
+        split_tps=bool(data.get("split_tps")) if data.get("split_tps") is not None else True,
+        tp_split_ratios=_copy_list(data.get("tp_split_ratios") or [0.5, 0.3, 0.2]),
+        tp_lot_mode=str(data.get("tp_lot_mode") or "split"),  # "split" or "equal"
+        enable_breakeven=bool(data.get("enable_breakeven")) if data.get("enable_breakeven") is not None else True,
+        symbol_suffix=str(data.get("symbol_suffix") or ""),
+        telegram_channel_ids=_copy_list(data.get("telegram_channel_ids") or []),
+        paused=bool(data.get("paused")) if data.get("paused") is not None else False,
+    )
+
+
 def get_user_settings(user_id: str) -> Optional[UserSettings]:
     """Get user trading settings from Supabase.
 
+    The row is cached for a short TTL and a fresh UserSettings is built
+    from it on every call; update_user_settings() drops the cached row.
+
     Args:
         user_id: User UUID.
 
     Returns:
         UserSettings object or None if not found.
     """
+    hit, data = cache.user_settings_cache.get(user_id)
+    if hit:
+        return _user_settings_from_row(user_id, data)
+
     try:
         supabase = get_supabase_admin()
-        result = supabase.table("user_settings_v2").select("*").eq("user_id", user_id).execute()
+        result = supabase.table("user_settings_v2").select(_SETTINGS_COLUMNS).eq("user_id", user_id).execute()
 
         if result.data and len(result.data) > 0:
             data = result.data[0]
-            return UserSettings(
-                user_id=user_id,
-                max_risk_percent=float(data.get("max_risk_percent") or 2.0),
-                max_lot_size=float(data.get("max_lot_size") or 0.1),
-                max_open_trades=int(data.get("max_open_trades") or 5),
-                lot_reference_balance=float(data.get("lot_reference_balance") or 500.0),
-                lot_reference_size_gold=float(data.get("lot_reference_size_gold") or 0.04),
-                lot_reference_size_default=float(data.get("lot_reference_size_default") or 0.01),
-                auto_accept_symbols=data.get("auto_accept_symbols") or ["XAUUSD", "GOLD"],
-                gold_market_threshold=float(data.get("gold_market_threshold") or 3.0),
-                split_tps=bool(data.get("split_tps")) if data.get("split_tps") is not None else True,
-                tp_split_ratios=data.get("tp_split_ratios") or [0.5, 0.3, 0.2],
-                tp_lot_mode=str(data.get("tp_lot_mode") or "split"),  # "split" or "equal"
-                enable_breakeven=bool(data.get("enable_breakeven")) if data.get("enable_breakeven") is not None else True,
-                symbol_suffix=str(data.get("symbol_suffix") or ""),
-                telegram_channel_ids=data.get("telegram_channel_ids") or [],
-                paused=bool(data.get("paused")) if data.get("paused") is not None else False,
-            )
+            cache.user_settings_cache.set(user_id, data)
+            return _user_settings_from_row(user_id, data)
         return None
     except Exception as e:
         log.error("Error getting user settings", user_id=user_id, error=str(e))
@@ -203,9 +258,48 @@ def update_user_settings(user_id: str, updates: Dict[str, Any]) -> bool:
         if not filtered_updates:
             return True
 
-        result = supabase.table("user_settings_v2").update(filtered_updates).eq("user_id", user_id).execute()
+        result = supabase.table("user_settings_v2").update(
+            filtered_updates, count="exact", returning="minimal"
+        ).eq("user_id", user_id).execute()
+        cache.invalidate_settings(user_id)
 
-        return bool(result.data)
+        return bool(result.count)
     except Exception as e:
         log.error("Error updating user settings", user_id=user_id, error=str(e))
         return False
+
+
+def get_user_profile(user_id: str) -> Tuple[Optional[UserCredentials], Optional[UserSettings]]:
+    """Get a user's credentials and trading settings together.
+
+    Both rows come back from the get_user_profile database function in one
+    round trip (and are cached like the single lookups). Falls back to two
+    queries if the function is unavailable.
+
+    Args:
+        user_id: User UUID.
+
+    Returns:
+        (credentials, settings) - either may be None if not found.
+    """
+    creds_hit, creds = cache.credentials_cache.get(user_id)
+    settings_hit, settings_row = cache.user_settings_cache.get(user_id)
+    if creds_hit and settings_hit:
+        return creds, _user_settings_from_row(user_id, settings_row)
+
+    try:
+        supabase = get_supabase_admin()
+        result = supabase.rpc("get_user_profile", {"p_user_id": user_id}).execute()
+        profile = result.data or {}
+    except Exception as e:
+        log.warning("get_user_profile RPC failed, using separate queries", user_id=user_id, error=str(e))
+        return get_user_credentials(user_id), get_user_settings(user_id)
+
+    creds = settings = None
+    if profile.get("creds"):
+        creds = _credentials_from_row(user_id, profile["creds"])
+        cache.credentials_cache.set(user_id, creds)
+    if profile.get("settings"):
+        cache.user_settings_cache.set(user_id, profile["settings"])
+        settings = _user_settings_from_row(user_id, profile["settings"])
+    return creds, settings
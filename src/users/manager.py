@@ -1,14 +1,16 @@
 """User connection manager for multi-tenant signal copier."""
 import asyncio
-from typing import Dict, Optional, Set, Callable, List
+from contextlib import asynccontextmanager
+from typing import Awaitable, Dict, Optional, Callable, List
 from dataclasses import dataclass, field
 from datetime import datetime
 
 from ..utils.logger import log
 from ..utils.events import event_bus, Events
 from ..database import supabase_crud as crud
+from ..database.cache import invalidate as invalidate_cached_user, invalidate_settings
 from .credentials import (
-    get_user_credentials,
+    get_user_profile,
     get_user_settings,
     UserCredentials,
     UserSettings,
@@ -32,6 +34,10 @@ class AccountExecutor:
     is_connected: bool = False
 
 
+# UserConnection fields the manager's active/connected counters depend on
+_STATUS_FIELDS = frozenset({"telegram_connected", "metaapi_connected", "is_active"})
+
+
 @dataclass
 class UserConnection:
     """Represents a user's active connections."""
@@ -56,8 +62,25 @@ class UserConnection:
     connected_at: Optional[datetime] = None
     last_activity: Optional[datetime] = None
 
-    # Tasks
-    _tasks: Set[asyncio.Task] = field(default_factory=set)
+    # Tasks - every background task is a child of _task_group, which lives
+    # inside _supervisor_task; cancelling the supervisor cancels them all
+    _supervisor_task: Optional[asyncio.Task] = None
+    _task_group: Optional[asyncio.TaskGroup] = None
+    # Runs the initial Telegram + MetaApi connects together (see wait_connected)
+    _connect_task: Optional[asyncio.Task] = None
+    # Called with (active delta, fully-connected delta) when status changes
+    _status_listener: Optional[Callable[[int, int], None]] = field(default=None, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        # Status flags are set from the manager, listeners and API routes;
+        # reporting each change here keeps the manager's counts O(1)
+        listener = self.__dict__.get("_status_listener")
+        if listener is None or name not in _STATUS_FIELDS:
+            object.__setattr__(self, name, value)
+            return
+        was_active, was_connected = bool(self.is_active), bool(self.is_fully_connected)
+        object.__setattr__(self, name, value)
+        listener(bool(self.is_active) - was_active, bool(self.is_fully_connected) - was_connected)
 
     @property
     def is_fully_connected(self) -> bool:
@@ -75,9 +98,15 @@ class UserConnectionManager:
 
     def __init__(self):
         self._connections: Dict[str, UserConnection] = {}
-        self._lock = asyncio.Lock()
+        # One lock per user so connects/disconnects of different users don't
+        # queue behind each other. _connections itself is only mutated
+        # between awaits, so it needs no lock of its own. See _user_lock().
+        self._user_locks: Dict[str, asyncio.Lock] = {}
         self._running = False
         self._message_handler: Optional[Callable] = None
+        # Maintained by _track()/_on_status_change() rather than scanning _connections
+        self._active_count = 0
+        self._connected_count = 0
 
     def set_message_handler(self, handler: Callable):
         """Set the callback for handling incoming messages from all users.
@@ -90,12 +119,28 @@ class UserConnectionManager:
     @property
     def active_users(self) -> int:
         """Get count of active user connections."""
-        return sum(1 for c in self._connections.values() if c.is_active)
+        return self._active_count
 
     @property
     def connected_users(self) -> int:
         """Get count of fully connected users."""
-        return sum(1 for c in self._connections.values() if c.is_fully_connected)
+        return self._connected_count
+
+    def _on_status_change(self, active_delta: int, connected_delta: int):
+        """Apply a tracked connection's status change to the counters."""
+        self._active_count += active_delta
+        self._connected_count += connected_delta
+
+    def _track(self, conn: UserConnection, tracked: bool):
+        """Start or stop counting a connection in active_users/connected_users.
+
+        Args:
+            conn: Connection being added to or removed from _connections.
+            tracked: True when adding, False when removing.
+        """
+        sign = 1 if tracked else -1
+        conn._status_listener = self._on_status_change if tracked else None
+        self._on_status_change(sign * bool(conn.is_active), sign * bool(conn.is_fully_connected))
 
     async def start(self):
         """Start the connection manager."""
@@ -108,16 +153,62 @@ class UserConnectionManager:
         # Start trade sync loop (detects closed positions for win rate calculation)
         asyncio.create_task(self._trade_sync_loop())
 
+    async def prefetch_profiles(self, user_ids: List[str]):
+        """Load credentials and settings for several users concurrently.
+
+        Warms the credential/settings cache so the connect_user() calls that
+        follow (e.g. at startup) don't each wait on the database in turn.
+
+        Args:
+            user_ids: User UUIDs about to be connected.
+        """
+        results = await asyncio.gather(
+            *(asyncio.to_thread(get_user_profile, user_id) for user_id in user_ids),
+            return_exceptions=True,
+        )
+        failed = sum(1 for r in results if isinstance(r, Exception))
+        log.info("Prefetched user profiles", users=len(user_ids), failed=failed)
+
     async def stop(self):
         """Stop all user connections."""
         self._running = False
 
-        async with self._lock:
-            for user_id in list(self._connections.keys()):
-                await self._disconnect_user(user_id)
+        # Disconnect everyone at once - shutdown takes the slowest user's
+        # teardown rather than the sum of all of them
+        user_ids = list(self._connections.keys())
+        results = await asyncio.gather(
+            *(self.disconnect_user(user_id) for user_id in user_ids),
+            return_exceptions=True,
+        )
+        for user_id, result in zip(user_ids, results):
+            if isinstance(result, Exception):
+                log.error("Error disconnecting user", user_id=user_id, error=str(result))
 
         log.info("User connection manager stopped")
 
+    @asynccontextmanager
+    async def _user_lock(self, user_id: str):
+        """Hold a user's lock, dropping it again once the user is disconnected.
+
+        A waiter that wakes on a lock that was dropped meanwhile retries on
+        the current one, so two holders can never run for the same user.
+
+        Args:
+            user_id: User UUID.
+        """
+        while True:
+            lock = self._user_locks.setdefault(user_id, asyncio.Lock())
+            async with lock:
+                if self._user_locks.get(user_id) is not lock:
+                    continue
+                try:
+                    yield
+                finally:
+                    # Otherwise every user ever seen keeps a lock forever
+                    if user_id not in self._connections:
+                        del self._user_locks[user_id]
+                return
+
     async def connect_user(self, user_id: str, skip_telegram: bool = False) -> bool:
         """Start connections for a user.
 
@@ -129,14 +220,14 @@ class UserConnectionManager:
         Returns:
             True if connections started successfully.
         """
-        async with self._lock:
+        async with self._user_lock(user_id):
             if user_id in self._connections and self._connections[user_id].is_active:
                 log.debug("User already connected", user_id=user_id)
                 return True
 
-            # Load user credentials and settings
-            credentials = get_user_credentials(user_id)
-            settings = get_user_settings(user_id)
+            # Load user credentials and settings - the Supabase client is
+            # synchronous, so keep it off the event loop
+            credentials, settings = await asyncio.to_thread(get_user_profile, user_id)
 
             if not credentials:
                 log.warning("No credentials found for user", user_id=user_id)
@@ -156,25 +247,79 @@ class UserConnectionManager:
             )
 
             self._connections[user_id] = conn
+            self._track(conn, True)
 
             log.info("User connection created", user_id=user_id, skip_telegram=skip_telegram)
 
-            # Start connections in background tasks
+            # Start connections in a background task, Telegram and MetaApi concurrently
             # In shared listener mode, we skip individual Telegram listeners
+            connects = []
             if credentials.has_telegram_credentials and not skip_telegram:
-                task = asyncio.create_task(self._connect_telegram(user_id))
-                conn._tasks.add(task)
+                connects.append(self._connect_telegram(user_id))
             elif skip_telegram:
                 # Mark telegram as "connected" since shared listener handles it
                 conn.telegram_connected = True
                 log.info(f"User {user_id[:8]} using shared Telegram listener")
 
             if credentials.has_metatrader_credentials:
-                task = asyncio.create_task(self._connect_metaapi(user_id))
-                conn._tasks.add(task)
+                connects.append(self._connect_metaapi(user_id))
+
+            if connects:
+                ready = asyncio.get_running_loop().create_future()
+                conn._supervisor_task = asyncio.create_task(self._supervise(conn, connects, ready))
+                # Returns once _task_group and _connect_task exist
+                await ready
 
             return True
 
+    async def _supervise(self, conn: UserConnection, connects: List[Awaitable], ready: asyncio.Future):
+        """Own a user's background tasks until _disconnect_user() cancels this.
+
+        Children must handle their own errors: an exception escaping one
+        would make the TaskGroup cancel the user's other tasks.
+
+        Args:
+            conn: User connection whose tasks to run.
+            connects: _connect_telegram / _connect_metaapi coroutines.
+            ready: Resolved once conn._task_group accepts tasks.
+        """
+        async with asyncio.TaskGroup() as task_group:
+            conn._task_group = task_group
+            conn._connect_task = task_group.create_task(self._run_connects(conn.user_id, connects))
+            ready.set_result(None)
+            # Keep the group open for tasks started later (e.g. the listener)
+            await asyncio.Event().wait()
+
+    async def _run_connects(self, user_id: str, connects: List[Awaitable]):
+        """Run a user's connection coroutines concurrently.
+
+        Args:
+            user_id: User UUID.
+            connects: _connect_telegram / _connect_metaapi coroutines.
+        """
+        results = await asyncio.gather(*connects, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                log.error("User connection failed", user_id=user_id[:8], error=str(result))
+
+    async def wait_connected(self, user_id: str, timeout: Optional[float] = None) -> bool:
+        """Wait for a user's initial Telegram/MetaApi connects to finish.
+
+        Args:
+            user_id: User UUID.
+            timeout: Maximum seconds to wait, None to wait until done.
+
+        Returns:
+            True if the user ended up fully connected.
+        """
+        conn = self._connections.get(user_id)
+        if not conn:
+            return False
+        if conn._connect_task:
+            # asyncio.wait neither raises nor cancels the task on timeout
+            await asyncio.wait({conn._connect_task}, timeout=timeout)
+        return conn.is_fully_connected
+
     async def disconnect_user(self, user_id: str) -> bool:
         """Stop connections for a user.
 
@@ -184,11 +329,11 @@ class UserConnectionManager:
         Returns:
             True if disconnected successfully.
         """
-        async with self._lock:
+        async with self._user_lock(user_id):
             return await self._disconnect_user(user_id)
 
     async def _disconnect_user(self, user_id: str) -> bool:
-        """Internal disconnect (must be called with lock held)."""
+        """Internal disconnect (must be called with the user's lock held)."""
         conn = self._connections.get(user_id)
         if not conn:
             return True
@@ -201,38 +346,45 @@ class UserConnectionManager:
 
         conn.is_active = False
 
-        # Cancel all tasks
-        for task in conn._tasks:
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+        # Cancel the supervisor - its TaskGroup cancels and reaps every task
+        if conn._supervisor_task:
+            conn._supervisor_task.cancel()
+            await asyncio.gather(conn._supervisor_task, return_exceptions=True)
 
-        # Disconnect Telegram
-        if conn.telegram_listener:
+        async def stop_telegram():
             try:
                 await conn.telegram_listener.stop()
             except Exception as e:
                 log.error("Error stopping Telegram listener", user_id=user_id, error=str(e))
 
-        # Disconnect ALL MT account executors
-        for account_id, account_executor in conn.account_executors.items():
-            if account_executor.executor:
-                try:
-                    await account_executor.executor.disconnect()
-                    set_account_connected(account_id, False)
-                except Exception as e:
-                    log.error(
-                        f"Error disconnecting account '{account_executor.account_alias}'",
-                        user_id=user_id,
-                        error=str(e),
-                    )
+        async def disconnect_account(account_id: str, account_executor: AccountExecutor):
+            try:
+                await account_executor.executor.disconnect()
+                set_account_connected(account_id, False)
+            except Exception as e:
+                log.error(
+                    f"Error disconnecting account '{account_executor.account_alias}'",
+                    user_id=user_id,
+                    error=str(e),
+                )
+
+        # Disconnect Telegram and ALL MT account executors concurrently
+        teardown = [
+            disconnect_account(account_id, account_executor)
+            for account_id, account_executor in conn.account_executors.items()
+            if account_executor.executor
+        ]
+        if conn.telegram_listener:
+            teardown.append(stop_telegram())
+        await asyncio.gather(*teardown)
 
         conn.account_executors.clear()
         conn.metaapi_executor = None
 
+        self._track(conn, False)
         del self._connections[user_id]
+        # A reconnect should see credentials/settings edited meanwhile
+        invalidate_cached_user(user_id)
         log.info("User disconnected", user_id=user_id)
         return True
 
@@ -305,8 +457,7 @@ class UserConnectionManager:
                 conn.telegram_connected = False
                 log.info(f"Telegram listener ended for user {user_id[:8]}")
 
-            task = asyncio.create_task(run_listener_with_recovery())
-            conn._tasks.add(task)
+            conn._task_group.create_task(run_listener_with_recovery())
 
             # Wait a moment for initial connection to establish
             await asyncio.sleep(2)
@@ -505,10 +656,10 @@ class UserConnectionManager:
                     error=last_error,
                 )
 
-                # Clean up failed executor
+                # Clean up failed executor - drop its connection so the retry starts fresh
                 try:
                     if 'executor' in locals() and executor:
-                        await executor.disconnect()
+                        await executor.disconnect(discard=True)
                 except Exception:
                     pass
 
@@ -620,10 +771,21 @@ class UserConnectionManager:
         if not conn:
             return False
 
+        # Explicit reload - don't serve the settings from cache
+        invalidate_settings(user_id)
         settings = get_user_settings(user_id)
         if settings:
+            old_channels = conn.settings.telegram_channel_ids if conn.settings else None
             conn.settings = settings
 
+            # The listener caches its channel list - hand it the new one and
+            # reconnect so the channels are resolved again
+            listener = conn.telegram_listener
+            if listener and settings.telegram_channel_ids != old_channels:
+                listener.invalidate_config(settings.telegram_channel_ids or [])
+                listener.request_reconnect()
+                log.info("Telegram channels changed, reconnecting listener", user_id=user_id[:8])
+
             # Build updated executor settings
             from ..trading.executor import ExecutorSettings
             new_executor_settings = ExecutorSettings(
@@ -639,8 +801,8 @@ class UserConnectionManager:
             # Update settings on ALL connected executors
             updated_count = 0
             for account_executor in conn.account_executors.values():
-                if account_executor.executor and account_executor.executor._settings:
-                    account_executor.executor._settings = new_executor_settings
+                if account_executor.executor:
+                    account_executor.executor.refresh_settings(new_executor_settings)
                     updated_count += 1
 
             log.info(
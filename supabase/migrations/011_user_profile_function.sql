@@ -0,0 +1,52 @@
+-- Migration: Combined credentials + settings lookup
+-- Lets the backend load both rows for a user in one round trip
+
+-- =============================================================================
+-- Function: Get a user's credentials and trading settings
+-- Returns {"creds": {...} or null, "settings": {...} or null}
+-- Only the columns the backend reads are returned - keep these lists in sync
+-- with _CREDENTIALS_COLUMNS / _SETTINGS_COLUMNS in src/users/credentials.py
+-- =============================================================================
+CREATE OR REPLACE FUNCTION get_user_profile(p_user_id UUID)
+RETURNS JSON AS $$
+    SELECT json_build_object(
+        'creds', (
+            SELECT json_build_object(
+                'telegram_api_id', c.telegram_api_id,
+                'telegram_api_hash', c.telegram_api_hash,
+                'telegram_phone', c.telegram_phone,
+                'telegram_session_encrypted', c.telegram_session_encrypted,
+                'telegram_connected', c.telegram_connected,
+                'mt_login', c.mt_login,
+                'mt_server', c.mt_server,
+                'mt_platform', c.mt_platform,
+                'metaapi_account_id', c.metaapi_account_id,
+                'mt_connected', c.mt_connected
+            )
+            FROM user_credentials c WHERE c.user_id = p_user_id
+        ),
+        'settings', (
+            SELECT json_build_object(
+                'max_risk_percent', s.max_risk_percent,
+                'max_lot_size', s.max_lot_size,
+                'max_open_trades', s.max_open_trades,
+                'lot_reference_balance', s.lot_reference_balance,
+                'lot_reference_size_gold', s.lot_reference_size_gold,
+                'lot_reference_size_default', s.lot_reference_size_default,
+                'auto_accept_symbols', s.auto_accept_symbols,
+                'gold_market_threshold', s.gold_market_threshold,
+                'split_tps', s.split_tps,
+                'tp_split_ratios', s.tp_split_ratios,
+                'tp_lot_mode', s.tp_lot_mode,
+                'enable_breakeven', s.enable_breakeven,
+                'symbol_suffix', s.symbol_suffix,
+                'telegram_channel_ids', s.telegram_channel_ids,
+                'paused', s.paused
+            )
+            FROM user_settings_v2 s WHERE s.user_id = p_user_id
+        )
+    );
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+-- Backend only (service role); the result includes the encrypted Telegram session
+REVOKE EXECUTE ON FUNCTION get_user_profile(UUID) FROM PUBLIC, anon, authenticated;
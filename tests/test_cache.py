@@ -0,0 +1,149 @@
+"""Tests for the Supabase lookup caches."""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.database import cache
+from src.database import supabase
+from src.database.cache import TTLCache
+
+
+def settings_row(**overrides):
+    """Create a user_settings_v2 row."""
+    return {"user_id": "user-1", "max_lot_size": 0.1, "telegram_channel_ids": ["@signals"], **overrides}
+
+
+class TestTTLCache:
+    """Test cases for TTLCache."""
+
+    def test_miss(self):
+        """Test that an unknown key is a miss."""
+        assert TTLCache().get("key") == (False, None)
+
+    def test_hit(self):
+        """Test that a stored value is returned."""
+        ttl_cache = TTLCache()
+        ttl_cache.set("key", {"a": 1})
+
+        assert ttl_cache.get("key") == (True, {"a": 1})
+
+    def test_cached_none_is_a_hit(self):
+        """Test that None can be cached and told apart from a miss."""
+        ttl_cache = TTLCache()
+        ttl_cache.set("key", None)
+
+        assert ttl_cache.get("key") == (True, None)
+
+    def test_expiry(self):
+        """Test that entries expire after the TTL."""
+        ttl_cache = TTLCache(ttl=30)
+        with patch("src.database.cache.time.monotonic", return_value=100.0):
+            ttl_cache.set("key", "value")
+        with patch("src.database.cache.time.monotonic", return_value=129.0):
+            assert ttl_cache.get("key") == (True, "value")
+        with patch("src.database.cache.time.monotonic", return_value=130.0):
+            assert ttl_cache.get("key") == (False, None)
+
+        assert "key" not in ttl_cache._data
+
+    def test_invalidate_key(self):
+        """Test that invalidate() drops only the given key."""
+        ttl_cache = TTLCache()
+        ttl_cache.set("a", 1)
+        ttl_cache.set("b", 2)
+
+        ttl_cache.invalidate("a")
+
+        assert ttl_cache.get("a") == (False, None)
+        assert ttl_cache.get("b") == (True, 2)
+
+    def test_invalidate_all(self):
+        """Test that invalidate() without a key clears everything."""
+        ttl_cache = TTLCache()
+        ttl_cache.set("a", 1)
+        ttl_cache.set("b", 2)
+
+        ttl_cache.invalidate()
+
+        assert not ttl_cache._data
+
+    def test_maxsize_resets(self):
+        """Test that the cache is cleared rather than growing past maxsize."""
+        ttl_cache = TTLCache(maxsize=2)
+        ttl_cache.set("a", 1)
+        ttl_cache.set("b", 2)
+        ttl_cache.set("b", 3)
+        assert len(ttl_cache._data) == 2
+
+        ttl_cache.set("c", 4)
+
+        assert ttl_cache.get("a") == (False, None)
+        assert ttl_cache.get("c") == (True, 4)
+
+
+class TestSettingsCache:
+    """Test cases for get_settings() / update_settings() caching."""
+
+    @pytest.fixture(autouse=True)
+    def clean_cache(self):
+        """Start and end every test with empty caches."""
+        cache.invalidate()
+        yield
+        cache.invalidate()
+
+    @pytest.fixture
+    def client(self):
+        """Patch the admin Supabase client."""
+        client = MagicMock()
+        select = client.table.return_value.select.return_value.eq.return_value.execute
+        select.return_value = MagicMock(data=[settings_row()])
+        with patch.object(supabase, "get_supabase_admin", return_value=client):
+            yield client
+
+    def test_get_settings_cached(self, client):
+        """Test that a second read is served from the cache."""
+        first = supabase.get_settings("user-1")
+        second = supabase.get_settings("user-1")
+
+        assert first == second
+        assert client.table.return_value.select.call_count == 1
+
+    def test_get_settings_returns_copies(self, client):
+        """Test that mutating a returned dict doesn't change the cached one."""
+        first = supabase.get_settings("user-1")
+        first["telegram_channel_ids"].append("@other")
+        first["max_lot_size"] = 5.0
+
+        second = supabase.get_settings("user-1")
+
+        assert second["telegram_channel_ids"] == ["@signals"]
+        assert second["max_lot_size"] == 0.1
+
+    def test_update_settings_invalidates(self, client):
+        """Test that update_settings() makes the next read hit the database."""
+        supabase.get_settings("user-1")
+        client.table.return_value.update.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[settings_row(max_lot_size=0.5)]
+        )
+        client.table.return_value.select.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[settings_row(max_lot_size=0.5)]
+        )
+
+        updated = supabase.update_settings("user-1", {"max_lot_size": 0.5})
+
+        assert updated["max_lot_size"] == 0.5
+        assert supabase.get_settings("user-1")["max_lot_size"] == 0.5
+
+    def test_update_settings_invalidates_derived_caches(self, client):
+        """Test that update_settings() drops the validator and raw-row caches too."""
+        cache.user_settings_cache.set("user-1", settings_row())
+        cache.validator_settings_cache.set("user-1", object())
+        cache.user_settings_cache.set("user-2", settings_row(user_id="user-2"))
+        client.table.return_value.update.return_value.eq.return_value.execute.return_value = MagicMock(
+            data=[settings_row()]
+        )
+
+        supabase.update_settings("user-1", {"max_lot_size": 0.1})
+
+        assert cache.user_settings_cache.get("user-1") == (False, None)
+        assert cache.validator_settings_cache.get("user-1") == (False, None)
+        assert cache.user_settings_cache.get("user-2")[0] is True
@@ -0,0 +1,174 @@
+"""Tests for the shared MetaApi connection pool."""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.trading import _connection_pool as pool
+
+
+def make_api():
+    """Create a fake MetaApi client whose accounts connect immediately."""
+    api = MagicMock()
+
+    def get_rpc_connection():
+        rpc = MagicMock()
+        rpc._closed = False
+        rpc.connect = AsyncMock()
+        rpc.wait_synchronized = AsyncMock()
+
+        async def close():
+            rpc._closed = True
+
+        rpc.close = AsyncMock(side_effect=close)
+        return rpc
+
+    account = MagicMock()
+    account.state = "DEPLOYED"
+    account.wait_connected = AsyncMock()
+    account.get_rpc_connection = MagicMock(side_effect=get_rpc_connection)
+    api.metatrader_account_api.get_account = AsyncMock(return_value=account)
+    return api
+
+
+class TestConnectionPool:
+    """Test cases for _connection_pool."""
+
+    @pytest.fixture(autouse=True)
+    async def clean_pool(self):
+        """Start every test with an empty pool and stop the reaper afterwards."""
+        pool._handles.clear()
+        pool._locks.clear()
+        pool._apis.clear()
+        yield
+        await pool.close_all()
+
+    @pytest.fixture
+    def api(self):
+        """Patch the pool to use a fake MetaApi client."""
+        api = make_api()
+        with patch.object(pool, "_get_api", return_value=api):
+            yield api
+
+    @pytest.mark.asyncio
+    async def test_reuses_connection(self, api):
+        """Test that a second caller gets the same handle without reconnecting."""
+        first = await pool.get_connection("token", "account-1")
+        second = await pool.get_connection("token", "account-1")
+
+        assert first is second
+        assert first.ref_count == 2
+        assert api.metatrader_account_api.get_account.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_separate_accounts(self, api):
+        """Test that different accounts get different handles."""
+        first = await pool.get_connection("token", "account-1")
+        second = await pool.get_connection("token", "account-2")
+
+        assert first is not second
+        assert first.rpc is not second.rpc
+
+    @pytest.mark.asyncio
+    async def test_release_keeps_connection_warm(self, api):
+        """Test that a released handle stays pooled for the next caller."""
+        handle = await pool.get_connection("token", "account-1")
+        pool.release(handle)
+
+        assert handle.ref_count == 0
+        assert handle.rpc.close.await_count == 0
+        assert await pool.get_connection("token", "account-1") is handle
+
+    @pytest.mark.asyncio
+    async def test_release_never_goes_negative(self, api):
+        """Test that releasing twice doesn't underflow the ref count."""
+        handle = await pool.get_connection("token", "account-1")
+        pool.release(handle)
+        pool.release(handle)
+
+        assert handle.ref_count == 0
+
+    @pytest.mark.asyncio
+    async def test_discard_evicts_connection(self, api):
+        """Test that a discarded handle is closed and not handed out again."""
+        handle = await pool.get_connection("token", "account-1")
+        await pool.discard(handle)
+
+        assert handle.rpc.close.await_count == 1
+        assert ("token", "account-1") not in pool._handles
+        assert ("token", "account-1") not in pool._locks
+
+        fresh = await pool.get_connection("token", "account-1")
+        assert fresh is not handle
+        assert fresh.ref_count == 1
+
+    @pytest.mark.asyncio
+    async def test_discard_stale_handle_keeps_current(self, api):
+        """Test that discarding an already replaced handle leaves the new one pooled."""
+        old = await pool.get_connection("token", "account-1")
+        await pool.discard(old)
+        current = await pool.get_connection("token", "account-1")
+
+        await pool.discard(old)
+
+        assert pool._handles[("token", "account-1")] is current
+        assert current.rpc.close.await_count == 0
+
+    @pytest.mark.asyncio
+    async def test_invalidate_account(self, api):
+        """Test that invalidate() closes only the given account's connections."""
+        first = await pool.get_connection("token", "account-1")
+        other_token = await pool.get_connection("token-2", "account-1")
+        second = await pool.get_connection("token", "account-2")
+
+        await pool.invalidate("account-1")
+
+        assert first.rpc.close.await_count == 1
+        assert other_token.rpc.close.await_count == 1
+        assert second.rpc.close.await_count == 0
+        assert list(pool._handles) == [("token", "account-2")]
+
+    @pytest.mark.asyncio
+    async def test_closed_connection_is_replaced(self, api):
+        """Test that a connection closed underneath the pool isn't reused."""
+        handle = await pool.get_connection("token", "account-1")
+        handle.rpc._closed = True
+
+        fresh = await pool.get_connection("token", "account-1")
+
+        assert fresh is not handle
+        assert fresh.ref_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_rpc_connect_is_closed(self, api):
+        """Test that an RPC connection that fails to connect is closed and not pooled."""
+        rpcs = []
+        account = await api.metatrader_account_api.get_account("account-1")
+
+        def failing_rpc():
+            rpc = MagicMock()
+            rpc.connect = AsyncMock(side_effect=Exception("boom"))
+            rpc.close = AsyncMock()
+            rpcs.append(rpc)
+            return rpc
+
+        account.get_rpc_connection = MagicMock(side_effect=failing_rpc)
+
+        with pytest.raises(RuntimeError, match="Failed to establish RPC connection"):
+            await pool.get_connection("token", "account-1")
+
+        assert rpcs[0].close.await_count == 1
+        assert ("token", "account-1") not in pool._handles
+
+    @pytest.mark.asyncio
+    async def test_close_all(self, api):
+        """Test that close_all() closes every connection and MetaApi client."""
+        handle = await pool.get_connection("token", "account-1")
+        pool._apis["token"] = api
+
+        await pool.close_all()
+
+        assert handle.rpc.close.await_count == 1
+        api.close.assert_called_once()
+        assert not pool._handles
+        assert not pool._locks
+        assert not pool._apis
+        assert pool._reaper_task is None
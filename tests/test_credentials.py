@@ -0,0 +1,35 @@
+"""Tests for user credentials/settings loading."""
+import re
+from pathlib import Path
+
+import pytest
+
+from src.users.credentials import _CREDENTIALS_COLUMNS, _SETTINGS_COLUMNS
+
+PROFILE_MIGRATION = Path(__file__).parent.parent / "supabase" / "migrations" / "011_user_profile_function.sql"
+
+
+class TestUserProfileFunction:
+    """Test that get_user_profile returns the same columns as the fallback queries."""
+
+    @pytest.fixture
+    def sql(self):
+        """Read the get_user_profile migration."""
+        return PROFILE_MIGRATION.read_text()
+
+    def returned_columns(self, sql, alias):
+        """Columns the function returns from the table aliased as alias."""
+        return re.findall(rf"'(\w+)', {alias}\.(\w+)", sql)
+
+    @pytest.mark.parametrize("alias, columns", [("c", _CREDENTIALS_COLUMNS), ("s", _SETTINGS_COLUMNS)])
+    def test_columns_match(self, sql, alias, columns):
+        """Test that each returned key is the same-named column, matching the Python column list."""
+        pairs = self.returned_columns(sql, alias)
+
+        assert all(key == column for key, column in pairs)
+        assert [key for key, _ in pairs] == columns.split(",")
+
+    def test_no_whole_rows(self, sql):
+        """Test that no full row (and with it every secret column) is returned."""
+        assert "row_to_json" not in sql
+        assert "*" not in sql
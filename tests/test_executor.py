@@ -0,0 +1,177 @@
+"""Tests for the trade executor."""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.trading import executor as executor_module
+from src.trading.executor import ExecutorSettings, TradeExecutor, _parse_tp_ratios
+
+
+class TestParseTpRatios:
+    """Test cases for _parse_tp_ratios."""
+
+    def test_none(self):
+        """Test that a missing setting uses the defaults."""
+        assert _parse_tp_ratios(None) is None
+
+    def test_string(self):
+        """Test a comma-separated string."""
+        assert _parse_tp_ratios("0.5, 0.3, 0.2") == [0.5, 0.3, 0.2]
+
+    def test_list(self):
+        """Test a list of numbers."""
+        assert _parse_tp_ratios([0.5, 0.5]) == [0.5, 0.5]
+
+    def test_empty_entries_skipped(self):
+        """Test that empty entries (trailing commas) are ignored."""
+        assert _parse_tp_ratios("0.5,,0.5,") == [0.5, 0.5]
+
+    def test_empty(self):
+        """Test that an empty setting uses the defaults."""
+        assert _parse_tp_ratios("") is None
+        assert _parse_tp_ratios([]) is None
+
+    @pytest.mark.parametrize("value", ["-0.5, 0.5", "0.5, abc", "0, 1", "1.2.3", [0.5, None]])
+    def test_invalid_uses_defaults(self, value):
+        """Test that any unusable entry falls back to the defaults."""
+        assert _parse_tp_ratios(value) is None
+
+
+class TestPositionBatches:
+    """Test cases for close_positions."""
+
+    @pytest.fixture
+    def executor(self):
+        """Create an executor with a mock RPC connection."""
+        executor = TradeExecutor(user_id="user-1", account_id="account-1", api_token="token")
+        executor.connection = MagicMock()
+        executor.connection.close_position = AsyncMock()
+        return executor
+
+    @pytest.mark.asyncio
+    async def test_close_positions(self, executor):
+        """Test that every position is closed."""
+        closed = await executor.close_positions(["1", "2", "3"])
+
+        assert closed == ["1", "2", "3"]
+        assert sorted(
+            call.kwargs["position_id"] for call in executor.connection.close_position.await_args_list
+        ) == ["1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_close_positions_partial_failure(self, executor):
+        """Test that one failed close doesn't stop the others."""
+        async def close_position(position_id):
+            if position_id == "2":
+                raise Exception("market closed")
+
+        executor.connection.close_position = AsyncMock(side_effect=close_position)
+
+        assert await executor.close_positions(["1", "2", "3"]) == ["1", "3"]
+
+    @pytest.mark.asyncio
+    async def test_close_positions_duplicates(self, executor):
+        """Test that a repeated ID is closed once and every RPC is awaited."""
+        closed = await executor.close_positions(["1", "2", "1"])
+
+        assert closed == ["1", "2"]
+        assert executor.connection.close_position.await_count == 2
+        assert executor.connection.close_position.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self, executor):
+        """Test that at most _POSITION_BATCH_CONCURRENCY calls are in flight."""
+        in_flight = 0
+        peak = 0
+
+        async def close_position(position_id):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+
+        executor.connection.close_position = AsyncMock(side_effect=close_position)
+
+        with patch.object(executor_module, "_POSITION_BATCH_CONCURRENCY", 3):
+            closed = await executor.close_positions([str(i) for i in range(10)])
+
+        assert len(closed) == 10
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_not_connected(self, executor):
+        """Test that closing requires a connection."""
+        executor.connection = None
+
+        with pytest.raises(RuntimeError):
+            await executor.close_positions(["1"])
+
+
+class TestExecutorSettings:
+    """Test cases for ExecutorSettings."""
+
+    @pytest.mark.parametrize("tp_ratios", [None, [0, 0], ["abc"], "0.5, x"])
+    def test_unusable_ratios_use_defaults(self, tp_ratios):
+        """Test that every constructor falls back to the default ratios."""
+        assert ExecutorSettings(tp_ratios=tp_ratios).tp_ratios == [0.5, 0.3, 0.2]
+
+    def test_split_ratios_normalized(self):
+        """Test that the ratios used for a signal sum to 1."""
+        executor_settings = ExecutorSettings(tp_ratios=[2, 1, 1])
+
+        assert executor_settings.split_ratios(3) == (0.5, 0.25, 0.25)
+        assert executor_settings.split_ratios(2) == pytest.approx((2 / 3, 1 / 3))
+
+
+class TestPlaceTpOrders:
+    """Test cases for concurrent TP leg submission."""
+
+    @pytest.fixture
+    def executor(self):
+        """Create an executor whose orders record how many are in flight."""
+        executor = TradeExecutor(user_id="user-1", account_id="account-1", api_token="token")
+        executor.placed = []
+        executor.peak = 0
+        in_flight = 0
+
+        async def place_order(tp_index, **kwargs):
+            nonlocal in_flight
+            in_flight += 1
+            executor.peak = max(executor.peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            if tp_index == 2:
+                raise Exception("requote")
+            executor.placed.append(tp_index)
+            return tp_index
+
+        executor._place_order = place_order
+        return executor
+
+    async def place(self, executor, leg_count):
+        """Place leg_count TP legs."""
+        return await executor._place_tp_orders(
+            signal=MagicMock(symbol="EURUSD"),
+            broker_symbol="EURUSD",
+            legs=[(0.01, 1.1 + i / 100) for i in range(leg_count)],
+            order_type="ORDER_TYPE_BUY",
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self, executor):
+        """Test that at most _MAX_CONCURRENT_TP_ORDERS legs are in flight and failures are skipped."""
+        with patch.object(executor_module, "_MAX_CONCURRENT_TP_ORDERS", 2):
+            executions = await self.place(executor, 5)
+
+        assert executions == [1, 3, 4, 5]
+        assert executor.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_sequential(self, executor):
+        """Test that a cap of 1 places the legs one after another, in TP order."""
+        with patch.object(executor_module, "_MAX_CONCURRENT_TP_ORDERS", 1):
+            await self.place(executor, 4)
+
+        assert executor.peak == 1
+        assert executor.placed == [1, 3, 4]
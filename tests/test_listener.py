@@ -0,0 +1,155 @@
+"""Tests for Telegram session persistence in the listener."""
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+
+from telethon.crypto import AuthKey
+
+from src.telegram import listener as listener_module
+from src.telegram.listener import TelegramListener, _TrackedStringSession
+
+
+class TestTrackedStringSession:
+    """Test cases for _TrackedStringSession."""
+
+    @pytest.fixture
+    def session(self):
+        """Create a session with a change counter."""
+        session = _TrackedStringSession(on_change=MagicMock())
+        session.set_dc(2, "149.154.167.51", 443)
+        session._on_change.reset_mock()
+        return session
+
+    def test_new_auth_key_notifies(self, session):
+        """Test that a new auth key is reported."""
+        session.auth_key = AuthKey(b"\x01" * 256)
+
+        session._on_change.assert_called_once()
+
+    def test_same_auth_key_is_silent(self, session):
+        """Test that re-assigning the current key is not a change."""
+        key = AuthKey(b"\x01" * 256)
+        session.auth_key = key
+        session._on_change.reset_mock()
+
+        session.auth_key = key
+
+        session._on_change.assert_not_called()
+
+    def test_dc_change_notifies(self, session):
+        """Test that a DC migration is reported and an unchanged DC isn't."""
+        session.set_dc(2, "149.154.167.51", 443)
+        session._on_change.assert_not_called()
+
+        session.set_dc(4, "149.154.167.91", 443)
+        session._on_change.assert_called_once()
+
+
+class TestSessionPersistence:
+    """Test cases for the session debounce/flush path."""
+
+    @pytest.fixture
+    def persisted(self):
+        """Record the session strings written to the database."""
+        writes = []
+
+        def update_user_credentials(user_id, updates):
+            writes.append(updates["telegram_session_encrypted"])
+            return True
+
+        with patch.object(listener_module, "update_user_credentials", side_effect=update_user_credentials):
+            yield writes
+
+    @pytest.fixture
+    def listener(self):
+        """Create a multi-tenant listener with a mock client."""
+        listener = TelegramListener(user_id="user-1234567", session_string="initial")
+        listener.client = MagicMock()
+        listener.client.session.save.return_value = "initial"
+        listener._session_dirty = False
+        return listener
+
+    @pytest.mark.asyncio
+    async def test_flush_unchanged_session(self, listener, persisted):
+        """Test that an unchanged session isn't written."""
+        assert await listener._flush_session() is False
+        assert persisted == []
+
+    @pytest.mark.asyncio
+    async def test_flush_changed_session(self, listener, persisted):
+        """Test that a changed session is written once."""
+        listener.client.session.save.return_value = "rotated"
+        listener._mark_session_dirty()
+
+        assert await listener._flush_session() is True
+        assert await listener._flush_session() is False
+        assert persisted == ["rotated"]
+
+    @pytest.mark.asyncio
+    async def test_session_string_cached_until_dirty(self, listener):
+        """Test that the session is only serialized again after a change."""
+        listener.get_session_string()
+        listener.get_session_string()
+        listener.client.session.save.assert_not_called()
+
+        listener._mark_session_dirty()
+        listener.get_session_string()
+        listener.get_session_string()
+        listener.client.session.save.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_persist_loop_debounces(self, listener, persisted):
+        """Test that a burst of changes lands in a single write of the latest session."""
+        with patch.object(listener_module, "SESSION_PERSIST_DEBOUNCE", 0.05):
+            task = asyncio.create_task(listener._session_persist_loop())
+            try:
+                listener.client.session.save.return_value = "dc-migrated"
+                listener._mark_session_dirty()
+                await asyncio.sleep(0.01)
+                listener.client.session.save.return_value = "new-auth-key"
+                listener._mark_session_dirty()
+                await asyncio.sleep(0.15)
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+        assert persisted == ["new-auth-key"]
+        assert not listener._session_dirty_event.is_set()
+
+
+class TestStartStop:
+    """Test cases for start() / stop() task ownership."""
+
+    @pytest.fixture
+    def listener(self):
+        """Create a listener whose connection never returns on its own."""
+        async def connect_and_listen(self):
+            await asyncio.Event().wait()
+
+        with patch.object(TelegramListener, "_connect_and_listen", connect_and_listen):
+            yield TelegramListener(user_id="user-1234567")
+
+    @pytest.mark.asyncio
+    async def test_stop_does_not_cancel_caller(self, listener):
+        """Test that stop() ends start() without cancelling the task that awaited it."""
+        caller = asyncio.create_task(listener.start(on_message=lambda message: None))
+        await asyncio.sleep(0.01)
+
+        await listener.stop()
+        await asyncio.wait_for(caller, timeout=1.0)
+
+        assert not caller.cancelled()
+        assert listener._main_task is None
+
+    @pytest.mark.asyncio
+    async def test_cancelling_caller_stops_loop(self, listener):
+        """Test that cancelling the caller still cancels the reconnect loop."""
+        caller = asyncio.create_task(listener.start(on_message=lambda message: None))
+        await asyncio.sleep(0.01)
+        main_task = listener._main_task
+
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+
+        assert caller.cancelled()
+        assert main_task.cancelled()
@@ -0,0 +1,157 @@
+"""Tests for the user connection manager."""
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.users import manager as manager_module
+from src.users.credentials import UserSettings
+from src.users.manager import AccountExecutor, UserConnection, UserConnectionManager
+
+
+def get_user_profile(user_id):
+    """Fake get_user_profile: "missing" has no profile, other users have nothing to connect."""
+    if user_id == "missing":
+        return None, None
+    credentials = SimpleNamespace(has_telegram_credentials=False, has_metatrader_credentials=False)
+    return credentials, SimpleNamespace(telegram_channel_ids=[])
+
+
+class TestStatusCounters:
+    """Test cases for the UserConnection.__setattr__ counter hook."""
+
+    @pytest.fixture
+    def manager(self):
+        """Create a manager."""
+        return UserConnectionManager()
+
+    def tracked(self, manager, **status):
+        """Create a connection and start counting it."""
+        conn = UserConnection(user_id="user-1", **status)
+        manager._track(conn, True)
+        return conn
+
+    def test_track(self, manager):
+        """Test that tracking counts the connection's current status."""
+        self.tracked(manager, is_active=True, telegram_connected=True, metaapi_connected=True)
+
+        assert manager.active_users == 1
+        assert manager.connected_users == 1
+
+    def test_status_changes(self, manager):
+        """Test that status flag changes update the counters."""
+        conn = self.tracked(manager, is_active=True)
+        assert (manager.active_users, manager.connected_users) == (1, 0)
+
+        conn.telegram_connected = True
+        assert manager.connected_users == 0
+        conn.metaapi_connected = True
+        assert manager.connected_users == 1
+        conn.metaapi_connected = True
+        assert manager.connected_users == 1
+        conn.telegram_connected = False
+        assert manager.connected_users == 0
+        conn.is_active = False
+        assert manager.active_users == 0
+
+    def test_untrack(self, manager):
+        """Test that untracking removes the connection from the counts and stops tracking it."""
+        conn = self.tracked(manager, is_active=True, telegram_connected=True, metaapi_connected=True)
+
+        manager._track(conn, False)
+        conn.is_active = True
+        conn.telegram_connected = False
+
+        assert (manager.active_users, manager.connected_users) == (0, 0)
+
+    def test_untracked_connection(self, manager):
+        """Test that connections that were never tracked don't touch the counters."""
+        conn = UserConnection(user_id="user-1")
+        conn.is_active = True
+
+        assert manager.active_users == 0
+
+
+class TestUserLocks:
+    """Test cases for per-user connect/disconnect locking."""
+
+    @pytest.fixture
+    def manager(self):
+        """Create a manager with a fake profile lookup."""
+        with patch.object(manager_module, "get_user_profile", side_effect=get_user_profile):
+            yield UserConnectionManager()
+
+    @pytest.mark.asyncio
+    async def test_connect_and_disconnect(self, manager):
+        """Test that the counters and locks follow connects and disconnects."""
+        assert await manager.connect_user("user-1") is True
+        assert manager.active_users == 1
+        assert "user-1" in manager._user_locks
+
+        assert await manager.disconnect_user("user-1") is True
+        assert manager.active_users == 0
+        assert manager._user_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_connect_drops_lock(self, manager):
+        """Test that a user that couldn't connect leaves no lock behind."""
+        assert await manager.connect_user("missing") is False
+
+        assert manager._user_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_connects_and_disconnects(self, manager):
+        """Test that racing calls for the same user run one at a time and leave consistent state."""
+        results = await asyncio.gather(
+            manager.connect_user("user-1"),
+            manager.connect_user("user-1"),
+            manager.disconnect_user("user-1"),
+            manager.connect_user("user-1"),
+            manager.connect_user("user-2"),
+        )
+
+        assert all(results)
+        assert sorted(manager._connections) == ["user-1", "user-2"]
+        assert sorted(manager._user_locks) == ["user-1", "user-2"]
+        assert manager.active_users == 2
+
+        await manager.stop()
+
+        assert manager._connections == {}
+        assert manager._user_locks == {}
+        assert manager.active_users == 0
+
+
+class TestReloadUserSettings:
+    """Test cases for pushing reloaded settings to a user's executors."""
+
+    @pytest.fixture
+    def executor(self):
+        """Create a mock executor."""
+        return MagicMock()
+
+    @pytest.fixture
+    def manager(self, executor):
+        """Create a manager with one connected user and account."""
+        manager = UserConnectionManager()
+        conn = UserConnection(user_id="user-1", settings=UserSettings(user_id="user-1"), is_active=True)
+        conn.account_executors["account-1"] = AccountExecutor("account-1", "metaapi-1", "Main", executor, True, True)
+        manager._connections["user-1"] = conn
+        return manager
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("stored, expected", [
+        ([0, 0], [0.5, 0.3, 0.2]),
+        (["abc", "def"], [0.5, 0.3, 0.2]),
+        ([-0.5, 1.5], [0.5, 0.3, 0.2]),
+        (["0.6", "0.4"], [0.6, 0.4]),
+    ])
+    async def test_tp_ratios_validated(self, manager, executor, stored, expected):
+        """Test that unusable stored tp_split_ratios reach the executor as the defaults."""
+        settings = UserSettings(user_id="user-1", tp_split_ratios=stored)
+        with patch.object(manager_module, "get_user_settings", return_value=settings):
+            assert await manager.reload_user_settings("user-1") is True
+
+        executor_settings = executor.refresh_settings.call_args.args[0]
+        assert executor_settings.tp_ratios == expected
+        assert sum(executor_settings.split_ratios(3)) == pytest.approx(1.0)
@@ -3,7 +3,7 @@ import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock, patch, MagicMock
 
-from src.trading.validator import TradeValidator
+from src.trading.validator import TradeValidator, ValidatorSettings
 from src.parser.models import ParsedSignal, ValidationResult
 
 
@@ -213,3 +213,101 @@ class TestTradeValidator:
         assert result.passed is True
         assert result.adjusted_lot_size is not None
         # Lot size should be reduced due to risk limits
+
+
+class TestValidateBatch:
+    """Test cases for TradeValidator.validate_batch."""
+
+    @pytest.fixture
+    def validator(self):
+        """Create a validator with a mock connection and default user settings."""
+        mock_connection = MagicMock()
+        mock_connection.get_symbol_price = AsyncMock(
+            side_effect=lambda symbol, **kwargs: {"bid": 1.0848, "ask": 1.0850}
+        )
+        with patch.object(ValidatorSettings, "for_user", return_value=ValidatorSettings()), \
+                patch("src.trading.validator.static_settings") as mock_settings:
+            mock_settings.symbol_whitelist = []
+            yield TradeValidator(mock_connection, user_id="user-1")
+
+    def make_signal(self, symbol="EURUSD", confidence=0.9):
+        """Create a BUY signal."""
+        return ParsedSignal(
+            direction="BUY",
+            symbol=symbol,
+            entry_price=1.0850,
+            stop_loss=1.0800,
+            take_profits=[1.0900],
+            confidence=confidence,
+            original_message="Test signal",
+            parsed_at=datetime.utcnow(),
+            warnings=[],
+        )
+
+    @pytest.fixture
+    def account_info(self):
+        """Create mock account info."""
+        return {"balance": 10000, "positions": [{"symbol": "EURUSD", "type": "POSITION_TYPE_BUY"}]}
+
+    @pytest.mark.asyncio
+    async def test_results_in_order(self, validator, account_info):
+        """Test that each signal gets its own result, in order."""
+        signals = [self.make_signal(), self.make_signal(confidence=0.4), self.make_signal("GBPUSD")]
+
+        results = await validator.validate_batch(signals, account_info)
+
+        assert [r.passed for r in results] == [True, False, True]
+        assert any("confidence too low" in e for e in results[1].errors)
+
+    @pytest.mark.asyncio
+    async def test_matches_validate(self, validator, account_info):
+        """Test that a batch gives the same results as validating one by one."""
+        signals = [self.make_signal(), self.make_signal("GBPUSD"), self.make_signal(confidence=0.4)]
+
+        batch = await validator.validate_batch(signals, account_info)
+        single = [await validator.validate(signal, account_info) for signal in signals]
+
+        assert batch == single
+
+    @pytest.mark.asyncio
+    async def test_fetches_each_symbol_once(self, validator, account_info):
+        """Test that prices are fetched once per distinct symbol, skipping rejected signals."""
+        signals = [
+            self.make_signal(),
+            self.make_signal(),
+            self.make_signal("GBPUSD"),
+            self.make_signal("USDJPY", confidence=0.4),
+        ]
+
+        await validator.validate_batch(signals, account_info)
+
+        fetched = sorted(call.args[0] for call in validator.connection.get_symbol_price.await_args_list)
+        assert fetched == ["EURUSD", "GBPUSD"]
+
+    @pytest.mark.asyncio
+    async def test_price_failure_is_warning(self, validator, account_info):
+        """Test that a failed price fetch only warns for that symbol."""
+        def get_symbol_price(symbol, **kwargs):
+            if symbol == "GBPUSD":
+                raise Exception("no quote")
+            return {"bid": 1.0848, "ask": 1.0850}
+
+        validator.connection.get_symbol_price = AsyncMock(side_effect=get_symbol_price)
+
+        results = await validator.validate_batch(
+            [self.make_signal(), self.make_signal("GBPUSD")], account_info
+        )
+
+        assert all(r.passed for r in results)
+        assert not any("Could not fetch price" in w for w in results[0].warnings)
+        assert any("Could not fetch price for GBPUSD" in w for w in results[1].warnings)
+
+    @pytest.mark.asyncio
+    async def test_no_user(self, account_info):
+        """Test that every signal fails without a user context."""
+        validator = TradeValidator(MagicMock())
+
+        results = await validator.validate_batch([self.make_signal(), self.make_signal()], account_info)
+
+        assert len(results) == 2
+        assert not any(r.passed for r in results)